@@ -3,10 +3,14 @@ Handles the environment the rover will operate in
 """
 
 import enum
+import logging
 import numpy as np
 
 from digital_twin.rover import Rover
 from digital_twin.constants import METERS_PER_TILE, DISTANCE_BETWEEN_MOTORS
+from digital_twin.maths_helper import RNG
+
+logger = logging.getLogger(__name__)
 
 
 class EnvType(enum.Enum):
@@ -29,6 +33,12 @@ class EnvType(enum.Enum):
     """ The goal position of the rover. GREEN"""
 
 
+ENV_TYPE_INDICES = {env_type: index for index, env_type in enumerate(EnvType)}
+""" The index of each environment type, as used in Environment.as_array """
+ENV_TYPES = tuple(EnvType)
+""" The environment types, each at its index in ENV_TYPE_INDICES """
+
+
 def get_environment_type_from_value(value: tuple[int]) -> EnvType:
     """
     :param value: The value (colour) of the EnvType enum
@@ -53,6 +63,9 @@ class Environment:
     _map: list[list[EnvType]]
         A 2D list representing the simple top-down view of the environment
 
+    _tile_indices: np.ndarray
+        The ENV_TYPE_INDICES of the map's tiles, kept alongside it for array access
+
     _rover: Rover
         The rover acting within the environment
 
@@ -76,6 +89,9 @@ class Environment:
     set_tile(x: int, y: int, eType: EnvType)
         Sets a tile within the map to be a certain environment type
 
+    set_tiles(tile_indices: np.ndarray)
+        Sets every tile of the environment at once from an array
+
     get_tile(x: int, y: int) -> EnvType
         Gets the type of the tile at the coordinates given
 
@@ -103,6 +119,9 @@ class Environment:
         """ The 2D representation of the environment from a top-down view 
             Each tile is accessed using its coordinates (x, y) by self._map[y][x]
         """
+        self._tile_indices: np.ndarray = np.full((height, width), ENV_TYPE_INDICES[EnvType.EMPTY],
+                                                 dtype=np.uint8)
+        """ The ENV_TYPE_INDICES of each tile in the map, accessed by self._tile_indices[y, x] """
 
         self._rover: Rover = None
         """ The rover acting within the environment """
@@ -185,6 +204,20 @@ class Environment:
         :param env_type: The environment type the tile should be
         """
         self._map[y][x] = env_type
+        self._tile_indices[y, x] = ENV_TYPE_INDICES.get(env_type, 0)
+
+    def set_tiles(self, tile_indices: np.ndarray):
+        """
+        Sets every tile within the environment at once
+
+        :param tile_indices: A (height, width) array of the ENV_TYPE_INDICES of each tile
+        """
+        if np.shape(tile_indices) != self._tile_indices.shape:
+            raise ValueError(f"Tiles of shape {np.shape(tile_indices)} do not fit an environment "
+                             f"of shape {self._tile_indices.shape}")
+
+        self._tile_indices = np.array(tile_indices, dtype=np.uint8)
+        self._map = [[ENV_TYPES[index] for index in row] for row in self._tile_indices.tolist()]
 
     def get_tile(self, x: int, y: int):
         """
@@ -196,6 +229,12 @@ class Environment:
         """
         return self._map[y][x]
 
+    def as_array(self) -> np.ndarray:
+        """
+        :return: The map as a (height, width) array of the ENV_TYPE_INDICES of each tile
+        """
+        return self._tile_indices.copy()
+
     def size(self):
         """
         :return: The size of the environment's map in the form (width, height)
@@ -216,19 +255,17 @@ class Environment:
 
         :param perc: The decimal percentage of the total nodes to be obstacles
         """
-        assigned = 0
-
-        map_size = self.size()[0] * self.size()[1]
+        map_width, map_height = self.size()
+        obstacle_count = int(np.ceil(perc * map_width * map_height))
 
-        while assigned < perc * map_size:
-            abs_pos = np.random.randint(0, map_size)
+        # Only empty tiles can change to obstacles, so they are all drawn from in one call
+        empty_positions = np.flatnonzero(self._tile_indices == ENV_TYPE_INDICES[EnvType.EMPTY])
+        chosen_positions = RNG.choice(empty_positions,
+                                      min(obstacle_count, len(empty_positions)),
+                                      replace=False)
 
-            pos = (abs_pos % self.size()[0], abs_pos // self.size()[0])
-
-            # Only empty tiles can change to obstacles
-            if self.get_tile(pos[0], pos[1]) == EnvType.EMPTY:
-                self.set_tile(pos[0], pos[1], EnvType.OBSTACLE)
-                assigned += 1
+        for abs_pos in chosen_positions.tolist():
+            self.set_tile(abs_pos % map_width, abs_pos // map_width, EnvType.OBSTACLE)
 
     def get_path(self, width_val: float = DISTANCE_BETWEEN_MOTORS * 2,
                  should_generate: bool = True) -> list[tuple[int]]:
@@ -554,7 +591,7 @@ def pathfind(environment: Environment, start: tuple[int], end: tuple[int],
     :param width_val: The width of the line of sight
     :return: A list of the nodes from the start to end
     """
-    print(f"PATH FINDING BETWEEN {start} and {end}")
+    logger.debug("Path finding between %s and %s", start, end)
 
     env_width, env_height = environment.size()
 
@@ -577,11 +614,9 @@ def pathfind(environment: Environment, start: tuple[int], end: tuple[int],
             continue
 
         if node == end:
-            print("PATH FOUND")
+            logger.debug("Path found")
             break
 
-        # print(f"EXPLORE {node}")
-
         # DEBUGGING ONLY
         # environment.set_tile(node[0], node[1], EnvType.EXPLORED)
 
@@ -597,7 +632,7 @@ def pathfind(environment: Environment, start: tuple[int], end: tuple[int],
     reverse_path = []
 
     if parent[end[1]][end[0]] is None:
-        print("PATH FINDING FAILED")
+        logger.debug("Path finding failed")
         return []
 
     node = end
@@ -607,9 +642,9 @@ def pathfind(environment: Environment, start: tuple[int], end: tuple[int],
         node = parent[node[1]][node[0]]
         reverse_path.append(node)
 
-    path = [reverse_path[x] for x in range(len(reverse_path) - 1, -1, -1)]
+    path = reverse_path[::-1]
 
-    print("PATH FINDING COMPLETE")
+    logger.debug("Path finding complete")
 
     return path
 
@@ -2,10 +2,14 @@
 Loads an environment from a file
 """
 
+import numpy as np
 from PIL import Image
-from digital_twin.environment import Environment, EnvType, get_environment_type_from_value
+from digital_twin.environment import Environment, EnvType, ENV_TYPE_INDICES
 from digital_twin.constants import METERS_PER_TILE
 
+SCAN_BAND_TILE_ROWS = 8
+""" The number of rows of tiles whose pixels are classified together """
+
 
 def image_to_environment(width: float, height: float, image_filename: str = "resources/env.png") \
         -> Environment:
@@ -23,60 +27,80 @@ def image_to_environment(width: float, height: float, image_filename: str = "res
 
     env = Environment(width_tiles + 2, height_tiles + 2)
 
-    img = Image.open(image_filename, 'r')
+    with Image.open(image_filename, 'r') as img:
+        # Any alpha channel is ignored, as only the colours matter
+        pixels = np.asarray(img.convert("RGB"), dtype=np.uint32)
 
-    width_pixels_per_tile = int((img.size[0] / (width_tiles - 2)))
-    height_pixels_per_tile = int((img.size[1] / (height_tiles - 2)))
+    image_height, image_width = pixels.shape[:2]
 
-    start = None
-    end = []
+    width_pixels_per_tile = int((image_width / (width_tiles - 2)))
+    height_pixels_per_tile = int((image_height / (height_tiles - 2)))
+
+    # Packs each pixel's colour into a single integer, so colours compare in one operation
+    colours = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+
+    if width_pixels_per_tile == 0 or height_pixels_per_tile == 0:
+        # Tiles smaller than a pixel never contain any colour, so every tile is left empty
+        blocks_x, blocks_y = width_tiles, height_tiles
+        has_obstacle = has_start = has_end = np.zeros((height_tiles, width_tiles), dtype=bool)
+    else:
+        # Splits the image into a block of pixels per tile, dropping partial blocks at the edges
+        blocks_x = image_width // width_pixels_per_tile
+        blocks_y = image_height // height_pixels_per_tile
+        blocks = colours[:blocks_y * height_pixels_per_tile, :blocks_x * width_pixels_per_tile] \
+            .reshape(blocks_y, height_pixels_per_tile, blocks_x, width_pixels_per_tile)
 
-    for y in range(1, height_tiles - 1):
-        for x in range(1, width_tiles - 1):
-            if (x + 1) * width_pixels_per_tile > img.size[0] \
-                    or (y + 1) * height_pixels_per_tile > img.size[1]:
-                continue
+        has_obstacle = np.zeros((blocks_y, blocks_x), dtype=bool)
+        has_start = np.zeros((blocks_y, blocks_x), dtype=bool)
+        has_end = np.zeros((blocks_y, blocks_x), dtype=bool)
 
-            color_list = []
-            size_list = []
+        # The image is scanned a band of tile rows at a time, so each band's
+        # comparisons stay small enough to remain in cache
+        for band_y in range(0, blocks_y, SCAN_BAND_TILE_ROWS):
+            band = blocks[band_y:band_y + SCAN_BAND_TILE_ROWS]
 
-            for pixel_y in range(height_pixels_per_tile):
-                for pixel_x in range(width_pixels_per_tile):
-                    coord_x = x * width_pixels_per_tile + pixel_x
-                    coord_y = y * height_pixels_per_tile + pixel_y
+            for has_type, env_type in ((has_obstacle, EnvType.OBSTACLE),
+                                       (has_start, EnvType.START),
+                                       (has_end, EnvType.END)):
+                red, green, blue = env_type.value
+                has_type[band_y:band_y + SCAN_BAND_TILE_ROWS] = \
+                    (band == (red << 16) | (green << 8) | blue).any(axis=(1, 3))
 
-                    color = img.getpixel((coord_x, coord_y))
+    tiles = np.full((height_tiles + 2, width_tiles + 2), ENV_TYPE_INDICES[EnvType.EMPTY],
+                    dtype=np.uint8)
 
-                    if len(color) == 4:
-                        color = (color[0], color[1], color[2])
+    # Tiles whose block runs off the image are skipped
+    last_y = min(height_tiles - 1, blocks_y)
+    last_x = min(width_tiles - 1, blocks_x)
+    scanned_tiles = tiles[1:last_y, 1:last_x]
 
-                    if color not in color_list:
-                        color_list.append(color)
-                        size_list.append(1)
+    # Obstacles take precedence over the start, which takes precedence over the ends
+    is_obstacle = has_obstacle[1:last_y, 1:last_x]
+    is_end = has_end[1:last_y, 1:last_x] & ~is_obstacle
+    start_tiles = np.argwhere(has_start[1:last_y, 1:last_x] & ~is_obstacle)
+
+    scanned_tiles[is_obstacle] = ENV_TYPE_INDICES[EnvType.OBSTACLE]
+
+    start = None
 
-            chosen_color = EnvType.EMPTY.value
+    # Only the first start tile found, scanning row by row, is used
+    if len(start_tiles) > 0:
+        start_y, start_x = start_tiles[0].tolist()
+        is_end[start_y, start_x] = False
+        start = (start_x + 1, start_y + 1)
 
-            if EnvType.OBSTACLE.value in color_list:
-                chosen_color = EnvType.OBSTACLE.value
-            elif EnvType.START.value in color_list and start is None:
-                chosen_color = EnvType.START.value
-                start = (x, y)
-            elif EnvType.END.value in color_list:
-                chosen_color = EnvType.END.value
-                end.append((x, y))
+    scanned_tiles[is_end] = ENV_TYPE_INDICES[EnvType.END]
 
-            env_type = get_environment_type_from_value(chosen_color)
+    end = [(x + 1, y + 1) for y, x in np.argwhere(is_end).tolist()]
 
-            if env_type is not None:
-                env.set_tile(x, y, env_type)
+    if start is not None:
+        tiles[start[1], start[0]] = ENV_TYPE_INDICES[EnvType.START]
 
-    for x in range(width_tiles + 2):
-        env.set_tile(x, 0, EnvType.OBSTACLE)
-        env.set_tile(x, height_tiles + 1, EnvType.OBSTACLE)
+    # The environment is bordered by obstacles
+    tiles[[0, -1], :] = ENV_TYPE_INDICES[EnvType.OBSTACLE]
+    tiles[:, [0, -1]] = ENV_TYPE_INDICES[EnvType.OBSTACLE]
 
-    for y in range(height_tiles + 2):
-        env.set_tile(0, y, EnvType.OBSTACLE)
-        env.set_tile(width_tiles + 1, y, EnvType.OBSTACLE)
+    env.set_tiles(tiles)
 
     end_node_clusters = []
 
@@ -4,6 +4,9 @@ Helper file for maths functions
 
 import numpy as np
 
+RNG = np.random.default_rng()
+""" The random number generator shared by every random draw in the digital twin """
+
 
 def convert_angle_to_2d_vector(angle: float) -> tuple[float]:
     """
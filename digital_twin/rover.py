@@ -1,10 +1,10 @@
 """
 The simulated rover class
 """
-import numpy.random
+import numpy
 from digital_twin import rover_rpm_instructions
 from digital_twin.constants import TIME_BETWEEN_MOVEMENTS
-from digital_twin.maths_helper import convert_angle_to_2d_vector
+from digital_twin.maths_helper import convert_angle_to_2d_vector, RNG
 
 
 class Rover:
@@ -97,8 +97,8 @@ class Rover:
         motor2_speed_adj = motor2_speed
 
         if self.motor_stdev > 0:
-            motor1_randomness = numpy.random.normal(0, self.motor_stdev)
-            motor2_randomness = numpy.random.normal(0, self.motor_stdev)
+            # Both motors' noise is drawn in a single call
+            motor1_randomness, motor2_randomness = RNG.normal(0, self.motor_stdev, 2)
 
             motor1_speed_adj += motor1_randomness
             motor2_speed_adj += motor2_randomness
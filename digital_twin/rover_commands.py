@@ -3,6 +3,7 @@ Handles the commands the rover will receive
 """
 
 
+import logging
 from enum import Enum
 from queue import Queue
 from typing import Any
@@ -13,6 +14,8 @@ from digital_twin.rover import Rover
 from digital_twin.maths_helper import get_angle_from_vectors, convert_angle_to_2d_vector
 from digital_twin.environment import Environment
 
+logger = logging.getLogger(__name__)
+
 
 class RoverCommandType(Enum):
     """
@@ -167,15 +170,16 @@ class RoverCommands:
             if not self._command_queue.empty():
                 self._current_command = self._command_queue.get()
 
-                value = self._current_command[1]
-                if not isinstance(self._current_command[1], tuple):
-                    value = self._current_command[1] * self._current_command[2]\
-                            / constants.TIME_BETWEEN_MOVEMENTS
+                # The displayed value is only worked out when it is printed
+                if is_printing:
+                    value = self._current_command[1]
+                    if not isinstance(self._current_command[1], tuple):
+                        value = self._current_command[1] * self._current_command[2]\
+                                / constants.TIME_BETWEEN_MOVEMENTS
 
-                    if ROVER_TYPES[int(self._current_command[0])] == RoverCommandType.ROTATE:
-                        value *= 360 / (2 * np.pi)
+                        if ROVER_TYPES[int(self._current_command[0])] == RoverCommandType.ROTATE:
+                            value *= 360 / (2 * np.pi)
 
-                if is_printing:
                     # Sends command information to the console
                     print("COMMAND RUN:")
                     print(f"Command Type: {ROVER_TYPES[int(self._current_command[0])].name}")
@@ -204,7 +208,7 @@ def rover_instructions_to_json(instructions: list[tuple[float]]):
             named_type = "MINE"
         to_export.append({"type":named_type, "value":value})
 
-    print(to_export)
+    logger.debug("Exported instructions: %s", to_export)
     return to_export
 
 
@@ -323,7 +327,7 @@ def create_rover_instructions_from_path(env: Environment,
         # Gets the distance that the rover will traverse in meters
         distance = np.sqrt(dx * dx + dy * dy) * constants.METERS_PER_TILE
 
-        print(dx, dy, distance)
+        logger.debug("Moving %s, %s tiles (%s m)", dx, dy, distance)
 
         # The time the rover will move at 'max_speed_rpm' to reach its next goal
         time = distance / constants.ROVER_MAX_SPEED
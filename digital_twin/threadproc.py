@@ -3,7 +3,7 @@ Thread that runs the actions of the commands sent to the digital rover
 """
 
 import time
-from threading import Thread
+from threading import Event, Thread
 from digital_twin.rover_commands import RoverCommands
 from digital_twin.rover import Rover
 from digital_twin.constants import TIME_BETWEEN_MOVEMENTS
@@ -27,6 +27,9 @@ class RoverCommandThread(Thread):
     _is_viewing_mode: bool
         Whether a human is meant to view the commands
 
+    _stop_event: Event
+        Set when the thread should stop running
+
     """
     def __init__(self, rover: Rover):
         self._rover_commands: RoverCommands = RoverCommands()
@@ -35,6 +38,8 @@ class RoverCommandThread(Thread):
         """ The rover being updated """
         self._is_viewing_mode = True
         """ Whether a human is meant to view the commands """
+        self._stop_event = Event()
+        """ Set when the thread should stop running """
         Thread.__init__(self, daemon=True)
 
     def set_viewing_mode(self, new_viewing_mode: bool):
@@ -52,17 +57,37 @@ class RoverCommandThread(Thread):
         """
         self._rover = rover
 
+    def stop(self):
+        """
+        Stops the thread, waking it if it is waiting for its next update
+        """
+        self._stop_event.set()
+
     def run(self) -> None:
-        time.sleep(1)
-        while True:
+        if self._stop_event.wait(1):
+            return
+
+        # Looked up once, as they are used every update
+        update = self._rover_commands.update
+        is_stopped = self._stop_event.is_set
+        wait = self._stop_event.wait
+        monotonic = time.monotonic
+
+        # Updates are scheduled against fixed deadlines so their own run time does not add drift
+        deadline = monotonic()
+
+        while not is_stopped():
             # Updates the rover's commands
-            self._rover_commands.update(self._rover, self._is_viewing_mode)
+            update(self._rover, self._is_viewing_mode)
             if self._is_viewing_mode:
-                cur_time = time.time()
+                deadline += TIME_BETWEEN_MOVEMENTS
+
+                # Missed updates are dropped rather than run back to back
+                deadline = max(deadline, monotonic() - TIME_BETWEEN_MOVEMENTS)
 
-                while (time.time() - cur_time) < TIME_BETWEEN_MOVEMENTS:
-                    time.sleep(0)
+                wait(max(0, deadline - monotonic()))
             else:
+                deadline = monotonic()
                 time.sleep(0)
 
     def get_rover_command(self) -> RoverCommands:
@@ -3,6 +3,7 @@ The GUI handler of the system
 """
 import datetime
 import json
+import logging
 import os
 import sys
 import threading
@@ -10,16 +11,18 @@ import ctypes
 from typing import IO, Any
 
 import numpy
-from PyQt5.QtCore import QRectF, Qt, pyqtSignal, QCoreApplication, QEvent
+from PyQt5.QtCore import QRectF, QPointF, Qt, pyqtSignal, QCoreApplication, QEvent, QThread, \
+    QObject, QRunnable, QThreadPool
 from PyQt5.QtWidgets import QApplication, \
     QLabel, QMainWindow, QMenu, QFileDialog, QToolBar, QSpinBox, \
     QAction, QDockWidget, QVBoxLayout, QLineEdit, QWidget, QPushButton, QMessageBox
-from PyQt5.QtGui import QIntValidator, QPainter, QImage, QPixmap, QDoubleValidator
+from PyQt5.QtGui import QIntValidator, QPainter, QImage, QPixmap, QDoubleValidator, QColor, \
+    QPen, QPolygonF, QPainterPath, qRgba
 
 from digital_twin.rover import Rover
 from digital_twin.rover_simulation import simulate
 from digital_twin import constants
-from digital_twin.environment import EnvType
+from digital_twin.environment import EnvType, ENV_TYPE_INDICES
 from digital_twin.threadproc import RoverCommandThread
 from digital_twin.rover_commands import create_rover_instructions_from_path, \
     rover_instructions_to_json, create_rover_instructions_from_logs
@@ -27,6 +30,7 @@ from digital_twin.environment_interface import image_to_environment
 from spike_com.spike import SpikeHandler
 from discord_integration.discord import upload_log_file
 
+logger = logging.getLogger(__name__)
 
 if os.name == "nt":
     MY_APP_ID = 'gooogle.wallacerover.controlcentre.1.0.0'
@@ -51,18 +55,153 @@ ENVIRONMENT_LENGTH, ENVIRONMENT_WIDTH = 3.5, 3
 # """ The height of each tile in pixels """
 
 
-def get_rover_image(painter: QPainter, image: QImage, rover: Rover):
+def get_rover_image(painter: QPainter, pixmap: QPixmap, rover: Rover) -> QPixmap:
     """
     :param painter: The current GUI painter
-    :param image: The image of the rover
+    :param pixmap: The image of the rover
     :param rover: The rover being displayed
     :return: The image of the rover at the correct orientation
     """
 
     transform = painter.transform().rotateRadians(rover.get_direction() + numpy.pi / 2)
-    pixmap = QPixmap(image)
-    pixmap = pixmap.transformed(transform, Qt.SmoothTransformation)
-    return pixmap.toImage()
+    return pixmap.transformed(transform, Qt.SmoothTransformation)
+
+
+def get_obstacle_image(tiles: numpy.ndarray) -> QImage:
+    """
+    :param tiles: The (height, width) array of tile types from Environment.as_array
+    :return: An image with a pixel per tile, red for obstacles and transparent otherwise
+    """
+    height, width = tiles.shape
+    tiles = numpy.ascontiguousarray(tiles)
+    image = QImage(tiles.data, width, height, width, QImage.Format_Indexed8)
+
+    color_table = [qRgba(0, 0, 0, 0)] * len(EnvType)
+    color_table[ENV_TYPE_INDICES[EnvType.OBSTACLE]] = QColor(Qt.red).rgba()
+    image.setColorTable(color_table)
+
+    # Copy so the image no longer shares the array's memory
+    return image.copy()
+
+
+def get_tile_rects(tiles: list[tuple[int]], tile_xs: numpy.ndarray, tile_ys: numpy.ndarray,
+                   square_size: int) -> list[QRectF]:
+    """
+    :param tiles: The (x, y) coordinates of the tiles to mark
+    :param tile_xs: The screen x coordinate of each column of tiles
+    :param tile_ys: The screen y coordinate of each row of tiles
+    :param square_size: The size of each tile in pixels
+    :return: The rects of the markers on the given tiles, with all coordinates computed at once
+    """
+    if not tiles:
+        return []
+
+    tiles = numpy.asarray(tiles, dtype=numpy.intp)
+    margin = square_size * .1
+    # Converted to Python floats in one go, rather than Qt converting each numpy scalar
+    xs = (tile_xs[tiles[:, 0]] + margin).tolist()
+    ys = (tile_ys[tiles[:, 1]] + margin).tolist()
+
+    return [QRectF(x, y, square_size, square_size) for x, y in zip(xs, ys)]
+
+
+def get_polygon(xs: numpy.ndarray, ys: numpy.ndarray) -> QPolygonF:
+    """
+    :param xs: The x coordinates of the polygon's points
+    :param ys: The y coordinates of the polygon's points
+    :return: A polygon of the points, filled directly through its memory
+    """
+    polygon = QPolygonF(len(xs))
+
+    # Each QPointF is stored as two doubles, so the polygon's memory is viewed as an (N, 2) array
+    pointer = polygon.data()
+    pointer.setsize(len(xs) * 2 * numpy.dtype(numpy.float64).itemsize)
+    points = numpy.frombuffer(pointer, dtype=numpy.float64).reshape(-1, 2)
+    points[:, 0] = xs
+    points[:, 1] = ys
+
+    return polygon
+
+
+class PathfindingThread(QThread):
+    """ Finds an environment's path away from the GUI thread """
+
+    path_ready = pyqtSignal(list)
+
+    def __init__(self, environment, **kwargs):
+        super().__init__(**kwargs)
+        self.environment = environment
+
+    def run(self):
+        """
+            Finds the path, handing it back to the GUI thread once done
+        """
+        self.path_ready.emit(self.environment.get_path() or [])
+
+
+class EnvironmentLoaderSignals(QObject):  # pylint: disable=R0903
+    """ The signals an EnvironmentLoader sends back to the GUI thread """
+
+    loaded = pyqtSignal(object)
+
+
+class EnvironmentLoader(QRunnable):  # pylint: disable=R0903
+    """ Loads an environment from its image away from the GUI thread """
+
+    def __init__(self, image_filename: str):
+        super().__init__()
+        self.image_filename = image_filename
+        self.signals = EnvironmentLoaderSignals()
+
+    def run(self):
+        """
+            Loads the environment, handing it back to the GUI thread once done
+        """
+        environment = image_to_environment(ENVIRONMENT_LENGTH, ENVIRONMENT_WIDTH,
+                                           image_filename=self.image_filename)
+        self.signals.loaded.emit(environment)
+
+
+class GridRenderCache:
+    """ The drawing data a Grid keeps between paints """
+
+    def __init__(self):
+        # The screen coordinates of each column and row of tiles, kept until the tile size changes
+        self.tile_xs = None
+        self.tile_ys = None
+        # The pixels per meter of the environment and the rover's size in pixels, kept likewise
+        self.pixels_per_meter = 0
+        self.rover_size = 0
+
+        # The obstacles are drawn from a single image rather than tile by tile
+        self.obstacle_image = None
+        # The parts of the grid that never change, drawn once and reused every paint
+        self.static_layer = None
+        # The goal markers and path, drawn over the trail and only redrawn when either changes
+        self.overlay_layer = None
+
+    def set_tile_size(self, square_size: int, env_width: int, env_height: int):
+        """
+            Recalculates the tile positions and scale for tiles of the given size
+
+        :param square_size: The size of a tile in pixels, not including the gap between tiles
+        :param env_width: The number of columns of tiles
+        :param env_height: The number of rows of tiles
+        """
+        self.tile_xs = TILE_START_X + numpy.arange(env_width, dtype=numpy.int32) \
+            * (square_size + 2)
+        self.tile_ys = TILE_START_Y + numpy.arange(env_height, dtype=numpy.int32) \
+            * (square_size + 2)
+
+        self.pixels_per_meter = (square_size + 2) / constants.METERS_PER_TILE
+        self.rover_size = constants.DISTANCE_BETWEEN_MOTORS * self.pixels_per_meter
+
+    def clear_layers(self):
+        """
+            Drops the cached layers so they are redrawn on the next paint
+        """
+        self.static_layer = None
+        self.overlay_layer = None
 
 
 class Grid(QWidget):
@@ -73,7 +212,8 @@ class Grid(QWidget):
     def __init__(self, environment, **kwargs):
         super().__init__(**kwargs)
 
-        self.setAutoFillBackground(True)
+        # The static layer's background covers every paint, so Qt need not clear the Grid first
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
 
         pallet = self.palette()
         pallet.setColor(self.backgroundRole(), Qt.gray)
@@ -82,11 +222,10 @@ class Grid(QWidget):
         self.setFixedSize(800, 800)
         self.columns = 400
         self.rows = 300
-        self.environment = environment
-        self.square_size = int(numpy.min([
-            (self.width() - TILE_START_X) / self.environment.size()[0] - 2,
-            (self.height() - TILE_START_Y) / self.environment.size()[1] - 2
-        ]))
+        self.environment = None
+        self.square_size = 0
+        # The tile positions, obstacle image and drawn layers, kept between paints
+        self._cache = GridRenderCache()
 
         # some random objects
         self.objects = [
@@ -96,109 +235,263 @@ class Grid(QWidget):
             (12, 22),
         ]
 
-        self.rover_points = []
+        # The rover's trail, kept as a polygon so each paint draws it without rebuilding it
+        self.rover_points = set()
+        self._trail_polygon = QPolygonF()
+        self._trail_pen = QPen(Qt.yellow, 3, Qt.SolidLine, Qt.RoundCap)
         self.is_log_mode = False
 
-    def paintEvent(self, _):  # pylint: disable=C0103
+        # The rover's image, loaded once rather than decoded every paint
+        self._rover_pixmap = QPixmap("resources/Rover.png")
+        # Where the rover was last drawn, so only that area and its new one are repainted
+        self._last_rover_rect = None
+
+        # The path being displayed as an (N, 2) array of tiles, and the list it was made from
+        self._path_source = None
+        self._path = None
+        # The path's drawing data, kept until the path or tile size changes
+        self._path_polygon = None
+        self._path_nodes = None
+
+        self.set_environment(environment)
+
+    def set_environment(self, environment):
         """
-            Paint the Grid
+            Shows the given Environment, so the Grid is reused rather than rebuilt for each one
+
+        :param environment: The new environment to display
         """
-        self.square_size = int(numpy.min([
-            (self.width() - TILE_START_X) / self.environment.size()[0] - 2,
-            (self.height() - TILE_START_Y) / self.environment.size()[1] - 2
-        ]))
+        self.environment = environment
+        self._update_square_size()
 
-        painter = QPainter(self)
+        self.clear_trail()
+        self.set_path(self.environment.get_path(should_generate=False))
+        self.invalidate()
 
-        # translate the painter by half a pixel to ensure correct line painting
+    def invalidate(self):
+        """
+            Redraws the cached obstacle and goal layers from the environment,
+            to be called whenever its tiles, start or end change
+        """
+        self._cache.obstacle_image = get_obstacle_image(self.environment.as_array())
+        self._cache.clear_layers()
+        self._last_rover_rect = None
+
+        self.update()
+
+    def clear_trail(self):
+        """
+            Removes the rover's trail from the Grid
+        """
+        self.rover_points = set()
+        self._trail_polygon = QPolygonF()
+
+        self.update()
+
+    def set_path(self, path: list[tuple[int]]):
+        """
+            Shows the given path, doing nothing if it is already being shown
+
+        :param path: The path of tiles to display
+        """
+        if path is self._path_source:
+            return
+
+        self._path_source = path
+        self._path = numpy.asarray(path, dtype=numpy.intp) \
+            if path is not None and len(path) > 1 else None
+        self._path_polygon = None
+        self._cache.overlay_layer = None
+
+        self.update()
+
+    def resizeEvent(self, event):  # pylint: disable=C0103
+        """
+            Called when the Grid is resized, the static layer is redrawn at the new size
+        """
+        self._update_square_size()
+        self._cache.clear_layers()
+        self._path_polygon = None
+        super().resizeEvent(event)
+
+    def _update_square_size(self):
+        """
+            Sets the size of the tiles so the whole environment fits in the Grid,
+            this only changes with the Grid's size so is not done every paint
+        """
+        env_width, env_height = self.environment.size()
+        self.square_size = min((self.width() - TILE_START_X) // env_width,
+                               (self.height() - TILE_START_Y) // env_height) - 2
+
+        self._cache.set_tile_size(self.square_size, env_width, env_height)
+
+    def _draw_static_layer(self) -> QPixmap:
+        """
+        :return: An opaque pixmap of the Grid's size containing its background and obstacles
+        """
+        background = self.palette().color(self.backgroundRole())
+        layer = QPixmap(self.size())
+        layer.fill(background)
+
+        painter = QPainter(layer)
         painter.translate(.5, .5)
-        painter.setRenderHints(painter.Antialiasing)
 
         width, height = self.environment.size()
-        # we need to add 1 to draw the topmost right/bottom lines too
-        # print(height)
-        # create a smaller rectangle
-        object_size = self.square_size
         margin = self.square_size * .1
-        object_rect = QRectF(margin, margin, object_size, object_size)
-        node_rect = QRectF(margin, margin, object_size / 2, object_size / 2)
-
-        for y in range(int(height)):
-            for x in range(int(width)):
-                # Gets the tile's position in the GUI
-                pos_x = TILE_START_X + x * (self.square_size + 2)
-                pos_y = TILE_START_Y + y * (self.square_size + 2)
-
-                # Gets the type of the tile, this has a colour corresponding to it
-                tile_type = self.environment.get_tile(x, y)
-                #  print("{x} {y}")
-                if tile_type is None:
-                    tile_type = EnvType.EMPTY
-                # Draws the tile
-                # painter.drawLine(pos_x, pos_y, pos_x + self.square_size, pos_y)
-                # painter.drawLine(pos_x, pos_y, pos_x, pos_y + self.square_size)
-                if tile_type == EnvType.OBSTACLE:
-                    painter.setBrush(Qt.red)
-                    painter.setPen(Qt.red)
-                    painter.drawRect(object_rect.translated(pos_x, pos_y))
-
-        painter.setBrush(Qt.yellow)
-        painter.setPen(Qt.yellow)
-
-        rover_point_rect = QRectF(0, 0, 2, 2)
-        for rover_point_x, rover_point_y in self.rover_points:
-            painter.drawEllipse(rover_point_rect.translated(rover_point_x - 1,
-                                                            rover_point_y - 1))
+        # Obstacles used to be square_size rects outlined with a 1 pixel pen, which
+        # reached half a pixel past the rect on each side
+        edge = margin - .5
+
+        # Scales the obstacle image so each of its pixels covers a tile
+        tiles_width = width * (self.square_size + 2)
+        tiles_height = height * (self.square_size + 2)
+        painter.drawImage(QRectF(TILE_START_X + edge, TILE_START_Y + edge,
+                                 tiles_width, tiles_height),
+                          self._cache.obstacle_image)
+
+        # A pixel also covers the gap to the next tile, which is the 1 pixel
+        # after the square_size + 1 pixels an outlined rect covered
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRects(
+            [QRectF(x + edge + self.square_size + 1, TILE_START_Y + edge, 1, tiles_height)
+             for x in self._cache.tile_xs] +
+            [QRectF(TILE_START_X + edge, y + edge + self.square_size + 1, tiles_width, 1)
+             for y in self._cache.tile_ys])
+        painter.end()
+
+        return layer
+
+    def _draw_overlay_layer(self) -> QPixmap:
+        """
+        :return: A transparent pixmap of the Grid's size containing the goal markers and path
+        """
+        layer = QPixmap(self.size())
+        layer.fill(Qt.transparent)
 
+        painter = QPainter(layer)
+        # translate the painter by half a pixel to ensure correct line painting
+        painter.translate(.5, .5)
+
+        # The goal markers are axis aligned so are drawn crisply without antialiasing
         painter.setBrush(Qt.green)
         painter.setPen(Qt.green)
         _, goal_pos = self.environment.get_start_end()
+        goal_rects = get_tile_rects(goal_pos, self._cache.tile_xs, self._cache.tile_ys,
+                                    self.square_size)
+        if goal_rects:
+            painter.drawRects(goal_rects)
 
-        for goal_pos_x, goal_pos_y in goal_pos:
-            goal_pos_x, goal_pos_y = TILE_START_Y + goal_pos_x * (self.square_size + 2), \
-                                     TILE_START_Y + goal_pos_y * (self.square_size + 2)
-            painter.drawRect(object_rect.translated(goal_pos_x, goal_pos_y))
+        painter.setPen(Qt.black)
+        painter.setRenderHint(QPainter.Antialiasing, True)
 
-        path = self.environment.get_path(should_generate=False)
+        if self._path is not None:
+            painter.drawPolyline(self._get_path_polygon())
 
-        painter.setPen(Qt.black)
+            # Each node once, centred on its tile
+            painter.drawPath(self._path_nodes)
+
+        painter.end()
+
+        return layer
+
+    def _get_path_polygon(self) -> QPolygonF:
+        """
+        :return: The centres of the path's tiles on screen
+        """
+        if self._path_polygon is None:
+            half_tile = 0.5 * (self.square_size + 2)
+            xs = self._cache.tile_xs[self._path[:, 0]] + half_tile
+            ys = self._cache.tile_ys[self._path[:, 1]] + half_tile
+
+            self._path_polygon = get_polygon(xs, ys)
+
+            # The top left of each node's circle, offset from the centre by a quarter tile
+            node_offset = self.square_size * .1 - 0.25 * (self.square_size + 2)
+            node_size = self.square_size // 2
 
-        if path is not None:
-            for i in range(len(path) - 1):
-                pos_1 = path[i]
-                pos_2 = path[i + 1]
-                x = [TILE_START_X + (pos_1[0] + 0.5) * (self.square_size + 2),
-                     TILE_START_X + (pos_2[0] + 0.5) * (self.square_size + 2)]
-                y = [TILE_START_Y + (pos_1[1] + 0.5) * (self.square_size + 2),
-                     TILE_START_Y + (pos_2[1] + 0.5) * (self.square_size + 2)]
-                painter.drawLine(int(x[0]), int(y[0]), int(x[1]), int(y[1]))
-                painter.drawEllipse(node_rect.translated(
-                    x[0] - 0.25 * ((self.square_size + 2)), y[0] - 0.25 * ((self.square_size + 2))))
-                painter.drawEllipse(node_rect.translated(
-                    x[1] - 0.25 * ((self.square_size + 2)), y[1] - 0.25 * ((self.square_size + 2))))
+            # Every node's circle in one path, so they are filled and outlined in a single call
+            self._path_nodes = QPainterPath()
+            self._path_nodes.setFillRule(Qt.WindingFill)
+            for node_x, node_y in zip((xs + node_offset).astype(int).tolist(),
+                                      (ys + node_offset).astype(int).tolist()):
+                self._path_nodes.addEllipse(node_x, node_y, node_size, node_size)
 
+        return self._path_polygon
+
+    def _get_rover_rect(self, rover: Rover) -> QRectF:
+        """
+        :param rover: The rover being displayed
+        :return: The area of the Grid the rover's image is drawn in
+        """
+        rover_x, rover_y = rover.get_location()
+        rover_size = self._cache.rover_size
+
+        rover_map_x = self._cache.pixels_per_meter * rover_x + TILE_START_X - rover_size / 2
+        rover_map_y = self._cache.pixels_per_meter * rover_y + TILE_START_Y - rover_size / 2
+
+        return QRectF(rover_map_x, rover_map_y, rover_size, rover_size)
+
+    def update_rover(self):
+        """
+            Schedules a paint of only the area the rover has moved across,
+            rather than the whole Grid
+        """
         rover = self.environment.get_rover()
 
-        if rover is not None:
-            rover_x, rover_y = rover.get_location()
+        if rover is None:
+            return
 
-            rover_dims = constants.DISTANCE_BETWEEN_MOTORS * (self.square_size + 2) \
-                         / constants.METERS_PER_TILE
+        rover_rect = self._get_rover_rect(rover)
+        # Padded for the half pixel translation and the trail's pen
+        dirty_rect = rover_rect.toAlignedRect().adjusted(-2, -2, 2, 2)
 
-            rover_map_x = ((self.square_size + 2) / constants.METERS_PER_TILE) * rover_x \
-                          + TILE_START_X - rover_dims / 2
-            rover_map_y = ((self.square_size + 2) / constants.METERS_PER_TILE) * rover_y \
-                          + TILE_START_Y - rover_dims / 2
+        if self._last_rover_rect is not None:
+            self.update(dirty_rect.united(self._last_rover_rect))
+        else:
+            self.update(dirty_rect)
 
-            rover_point = (rover_map_x + rover_dims / 2, rover_map_y + rover_dims / 2)
+        self._last_rover_rect = dirty_rect
 
-            if rover_point not in self.rover_points and self.is_log_mode:
-                self.rover_points.append(rover_point)
+    def paintEvent(self, event):  # pylint: disable=C0103
+        """
+            Paint the Grid, only redrawing what lies in the event's dirty region
+        """
+        painter = QPainter(self)
+        dirty_rect = event.rect()
+
+        if self._cache.static_layer is None or self._cache.static_layer.size() != self.size():
+            self._cache.static_layer = self._draw_static_layer()
+        painter.drawPixmap(dirty_rect, self._cache.static_layer, dirty_rect)
+
+        # The rover's trail as round points of a wide pen, drawn in one call
+        if not self._trail_polygon.isEmpty():
+            painter.save()
+            # translate the painter by half a pixel to ensure correct line painting
+            painter.translate(.5, .5)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(self._trail_pen)
+            painter.drawPoints(self._trail_polygon)
+            painter.restore()
+
+        if self._cache.overlay_layer is None or self._cache.overlay_layer.size() != self.size():
+            self._cache.overlay_layer = self._draw_overlay_layer()
+        painter.drawPixmap(dirty_rect, self._cache.overlay_layer, dirty_rect)
 
-            rover_rect = QRectF(rover_map_x, rover_map_y, rover_dims, rover_dims)
+        painter.translate(.5, .5)
+
+        rover = self.environment.get_rover()
 
-            painter.drawImage(rover_rect, get_rover_image(painter,
-                                                          QImage("resources/Rover.png"), rover))
+        if rover is not None:
+            rover_rect = self._get_rover_rect(rover)
+            rover_point = (rover_rect.center().x(), rover_rect.center().y())
+
+            if rover_point not in self.rover_points and self.is_log_mode:
+                self.rover_points.add(rover_point)
+                self._trail_polygon.append(QPointF(*rover_point))
+
+            rover_image = get_rover_image(painter, self._rover_pixmap, rover)
+            painter.drawPixmap(rover_rect, rover_image, QRectF(rover_image.rect()))
 
         painter.end()
 
@@ -264,6 +557,7 @@ class Window(QMainWindow):
         super().__init__(parent)
 
         self.cmd_thread = None
+        self.path_thread = None
         self.environment = None
         self.grid = None
         self.spike_handler = SpikeHandler()
@@ -275,12 +569,18 @@ class Window(QMainWindow):
 
         self._build_ui()
 
+        # Connected once, rather than on every connection attempt
+        self.update_rover_status.connect(self._on_rover_status)
+
     def closeEvent(self, _):  # pylint: disable=C0103
         """
             Called when window closes
         """
-        # Disconnect our spike handler
-        self.spike_handler.disconnect()
+        # Close our spike handler, stopping its threads and disconnecting
+        self.spike_handler.close()
+
+        if self.cmd_thread is not None:
+            self.cmd_thread.stop()
 
     def eventFilter(self, source, event):  # pylint: disable=C0103
         """
@@ -301,7 +601,7 @@ class Window(QMainWindow):
 
                     self.environment.set_start_direction(angle)
                     self.environment.get_rover().set_angle(angle)
-                    self.grid.repaint()
+                    self.grid.update_rover()
 
             # Editing the Ending Direction Textbox
             if source is self._end_dir_edit_box:
@@ -426,7 +726,7 @@ class Window(QMainWindow):
         """
             Dump rover logs
         """
-        log = self.spike_handler.get_log()
+        log = self.spike_handler.get_log_str()
         if log:
             
             log_name = f"logs/{datetime.datetime.now().strftime('%d-%m-%Y %H:%M:%S')}"
@@ -449,17 +749,29 @@ class Window(QMainWindow):
 
     def add_grid(self, environment):
         """
-            Add a Grid for the given Environment
+            Show the given Environment, adding the Grid the first time one is loaded
         """
-        self.grid = Grid(environment)
-        self.setCentralWidget(self.grid)
+        if self.grid is None:
+            self.grid = Grid(environment)
+            self.setCentralWidget(self.grid)
+        else:
+            self.grid.set_environment(environment)
 
     def load_environment(self, image_filename):
         """
-            Load an environment into the UI
+            Load an environment into the UI, reading its image on the thread pool
+        """
+        loader = EnvironmentLoader(image_filename)
+        loader.signals.loaded.connect(self._show_environment)
+        QThreadPool.globalInstance().start(loader)
+
+    def _show_environment(self, environment):
+        """
+            Show a loaded environment in the UI
+
+        :param environment: The environment loaded from an image
         """
-        self.environment = image_to_environment(ENVIRONMENT_LENGTH, ENVIRONMENT_WIDTH, 
-            image_filename=image_filename)
+        self.environment = environment
         self.environment.set_start_direction(-numpy.pi / 2)
 
         start_pos, _ = self.environment.get_start_end()
@@ -492,14 +804,14 @@ class Window(QMainWindow):
 
                 rover_command = self.cmd_thread.get_rover_command()
 
-                self.grid.rover_points = []
+                self.grid.clear_trail()
                 self.grid.is_log_mode = True
                 for command_type, value, time in cmds:
                     rover_command.add_command(command_type, value, time)
 
                 while not rover_command.is_empty():
                     QCoreApplication.processEvents()
-                    self.grid.repaint()
+                    self.grid.update_rover()
 
                 self.grid.is_log_mode = False
 
@@ -521,17 +833,21 @@ class Window(QMainWindow):
             Attempt to connect to rover and update the UI
         """
 
-        def _signal_callback(connected):
-            if connected:
-                self._show_message_box(QMessageBox.Information, "Connected!", "Connected to Rover")
-            else:
-                self._show_message_box(QMessageBox.Warning, "Failed!", "Failed to Connect to Rover")
-            self.rover_status_label.setText(f"Rover Status: {'Online' if connected else 'Offline'}")
-
         self.rover_status_label.setText("Rover Status: Connecting...")
-        self.update_rover_status.connect(_signal_callback)
         self.spike_handler.connect(self.update_rover_status.emit)
 
+    def _on_rover_status(self, connected):
+        """
+            Show the result of a connection attempt
+
+        :param connected: Whether the rover connected
+        """
+        if connected:
+            self._show_message_box(QMessageBox.Information, "Connected!", "Connected to Rover")
+        else:
+            self._show_message_box(QMessageBox.Warning, "Failed!", "Failed to Connect to Rover")
+        self.rover_status_label.setText(f"Rover Status: {'Online' if connected else 'Offline'}")
+
     def run_rover_main(self):
         """
             Execute the Rover Commands
@@ -547,24 +863,44 @@ class Window(QMainWindow):
             self.environment.set_end_direction(int(self._end_dir_edit_box.text()) \
                                                * numpy.pi / 2)
 
-        # Start rover command thread
-        self.cmd_thread = RoverCommandThread(rover)
-        self.cmd_thread.start()
-        rover_command = self.cmd_thread.get_rover_command()
-
         start_pos, _ = self.environment.get_start_end()
-        start_angle, end_angle = self.environment.get_start_end_directions()
+        start_angle, _ = self.environment.get_start_end_directions()
 
         rover.set_position(
             ((start_pos[0] + 0.5) * constants.METERS_PER_TILE,
              (start_pos[1] + 0.5) * constants.METERS_PER_TILE))
         rover.set_angle(start_angle)
 
-        # Get rover commands to send to physical rover
-        path = self.environment.get_path()
+        # The environment may have changed since it was last drawn
+        self.grid.invalidate()
+
+        # Pathfinding can take a while, so is kept off the GUI thread
+        if self.path_thread is None or not self.path_thread.isRunning():
+            self.path_thread = PathfindingThread(self.environment)
+            self.path_thread.path_ready.connect(self._run_rover_path)
+            self.path_thread.start()
+
+    def _run_rover_path(self, path):
+        """
+            Execute the Rover Commands along the given path
+
+        :param path: The path found for the rover to follow
+        """
+        rover = self.environment.get_rover()
+
+        # Start rover command thread, stopping any earlier one driving the same rover
+        if self.cmd_thread is not None:
+            self.cmd_thread.stop()
 
-        self.grid.repaint()
+        self.cmd_thread = RoverCommandThread(rover)
+        self.cmd_thread.start()
+        rover_command = self.cmd_thread.get_rover_command()
 
+        start_angle, end_angle = self.environment.get_start_end_directions()
+
+        self.grid.set_path(path)
+
+        # Get rover commands to send to physical rover
         rover_commands = create_rover_instructions_from_path(self.environment,
             path, start_angle, end_angle)
 
@@ -572,7 +908,7 @@ class Window(QMainWindow):
             rover_command.add_command(cmd_type, value, time)
 
         formatted_instructs = rover_instructions_to_json(rover_commands)
-        print(formatted_instructs)
+        logger.debug("Rover instructions: %s", formatted_instructs)
 
         if self.spike_handler.communication_handler is not None:
             print("Sending instructions...")
@@ -586,7 +922,7 @@ class Window(QMainWindow):
 
         while not rover_command.is_empty():
             QCoreApplication.processEvents()
-            self.grid.repaint()
+            self.grid.update_rover()
 
     def simulate_rover(self):
         """
@@ -608,7 +944,9 @@ class Window(QMainWindow):
 
         while thread.is_alive():
             QCoreApplication.processEvents()
-            self.grid.repaint()
+            # The simulation replaces the environment's path as it goes
+            self.grid.set_path(self.environment.get_path(should_generate=False))
+            self.grid.update()
 
 
 def setup() -> int:
@@ -3,10 +3,13 @@
     to a Spike
 """
 import time
+import queue
 import threading
 import serial
 from spike_com.host_files.protocol import Packet, class_by_code
 
+STOP_TIMEOUT = 2 # Seconds each thread is given to finish when stopping
+
 class CommunicationHandler:
     """
         Represents a Bluetooth connection to a Spike
@@ -20,6 +23,10 @@ class CommunicationHandler:
         self.socket = serial.Serial("/dev/rfcomm0", timeout=1)
         self.recv_thread = threading.Thread(target=self._recv_loop, daemon=True)
         self.lock = threading.Lock()
+        # Packets are written by their own thread, so sending never waits on a read
+        self.send_queue = queue.Queue()
+        self.send_thread = threading.Thread(target=self._send_loop, daemon=True)
+        self.running = True
 
     def start(self):
         """
@@ -27,6 +34,22 @@ class CommunicationHandler:
         """
         self.socket.flush()
         self.recv_thread.start()
+        self.send_thread.start()
+
+    def stop(self):
+        """
+            Stop the service and close the connection
+        """
+        self.running = False
+        # Wake both threads from any blocking read or write, so the port is
+        # not closed underneath them
+        self.socket.cancel_read()
+        self.socket.cancel_write()
+        self.send_queue.put(None) # Wakes the send loop
+        for thread in (self.recv_thread, self.send_thread):
+            if thread.is_alive():
+                thread.join(STOP_TIMEOUT)
+        self.socket.close()
 
     def send(self, packet):
         """
@@ -37,14 +60,23 @@ class CommunicationHandler:
         """
         assert isinstance(packet, Packet)
 
-        with self.lock:
-            payload = packet.pack()
-            payload = payload.replace(b"\x03", b"\x7e\x7e")
+        payload = packet.pack()
+        payload = payload.replace(b"\x03", b"\x7e\x7e")
+        self.send_queue.put(payload)
 
+    def _send_loop(self):
+        """
+            The send loop, the only writer to the socket so packets never interleave
+        """
+        while self.running:
+            payload = self.send_queue.get()
+            if payload is None:
+                break
             try:
                 self.socket.write(payload)
-            except BufferError as error:
+            except (BufferError, serial.SerialException) as error:
                 print(f"Error occured whilst sending: {error}")
+                continue
 
             print(f"Sent {len(payload)} bytes of data")
 
@@ -70,7 +102,7 @@ class CommunicationHandler:
         """
             The receive loop that handles listeners
         """
-        while True:
+        while self.running:
             raw = self._recv_raw()
             if raw:
                 code = Packet.get_code(raw)
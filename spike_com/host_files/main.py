@@ -1,6 +1,7 @@
 """
     Entry-Point of the Spike Host
 """
+import threading
 import time
 import clrprint
 from spike_com.host_files.protocol import Directions, Ping, DistanceSend
@@ -9,6 +10,8 @@ from spike_com.host_files.communicate import CommunicationHandler
 
 
 MAC = "30:E2:83:03:7C:71"
+CONNECT_TIMEOUT = 30 # Seconds the hub is given to start its main.py and answer a ping
+PING_INTERVAL = 1 # Seconds between pings whilst waiting for an answer
 
 class Handler:
     """
@@ -21,6 +24,7 @@ class Handler:
         """
         self.communication_handler = None
         self.connected = False
+        self._stopped = threading.Event() # Set by stop, ends the waits in start early
 
     def on_ping(self, *_):
         """
@@ -92,27 +96,40 @@ class Handler:
                             clr='red')
         self.communication_handler.send(directions)
 
+    def stop(self):
+        """
+            End the connection to the Rover
+        """
+        self._stopped.set()
+        # Taken before stopping, as start may also call stop from its own thread
+        communication_handler, self.communication_handler = self.communication_handler, None
+        if communication_handler is not None:
+            communication_handler.stop()
+        self.connected = False
+
     def start(self):
         """
-            Begin connection to the Rover
+            Begin connection to the Rover, returning False early if stop is called
         """
+        if self._stopped.is_set():
+            return False
         self.communication_handler = CommunicationHandler()
         self.communication_handler.add_listener(Ping, self.on_ping)
         self.communication_handler.add_listener(DistanceSend, self.on_distance_received)
         self.communication_handler.start()
 
-        # Ping first to check working
-        time.sleep(10)
+        # Ping until the hub answers, rather than waiting a fixed time for its main.py
+        # to start, pings sent before it is listening are answered once it is
         print("Checking connection...")
-
         self.connected = False
-        print("ping...")
-        self.communication_handler.send(Ping())
-        elapsed = 0
+        deadline = time.monotonic() + CONNECT_TIMEOUT
         while not self.connected:
-            if elapsed >= 15:
+            if time.monotonic() >= deadline:
+                return False
+            print("ping...")
+            self.communication_handler.send(Ping())
+            if self._stopped.wait(PING_INTERVAL):
+                self.stop() # The link may have been opened after stop was called
                 return False
-            time.sleep(1)
-            elapsed += 1
         print("Connection is established.")
         return self.communication_handler
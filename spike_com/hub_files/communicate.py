@@ -7,6 +7,14 @@ import uasyncio as asyncio # Called uasyncio in micropython
 from log import log
 from protocol import *
 
+# The host escapes the Hub killcode (0x03) as 0x7e7e
+_KILLCODE = b"\x7e\x7e"
+_KILLCODE_REPL = b"\x03"
+
+# Bounds of the receive loop poll interval when no data is available
+_IDLE_MIN_MS = 10
+_IDLE_MAX_MS = 200
+
 class CommunicationHandler:
     """
         Represents a Bluetooth connection to a Spike
@@ -21,11 +29,17 @@ class CommunicationHandler:
                                                 for testing purposes (default: False)
         """
         self.listeners = {}
+        self._vcp = hub.BT_VCP()
+        self._rx = bytearray() # Received bytes not yet handled
+        # Directions waiting to be handled, in the order they were received
+        self._directions = []
+        self._directions_ready = asyncio.Event()
 
     async def start(self):
         """
             Start the service
         """
+        asyncio.create_task(self._directions_loop())
         await self._recv_loop()
     
     def send(self, packet):
@@ -35,7 +49,7 @@ class CommunicationHandler:
             Args:
                 packet (Packet): Packet to send
         """
-        hub.BT_VCP().write(packet.pack())
+        self._vcp.write(packet.pack())
     
     def add_listener(self, packet_type, function):
         """
@@ -49,36 +63,81 @@ class CommunicationHandler:
     
     def _recv_raw(self):
         """
-            Receive bytes over communication link
+            Receive the next complete packet over communication link,
+                or None if one is not yet available
         """
         try:
-            raw = hub.BT_VCP().read()
+            chunk = self._vcp.read()
+        except:
+            chunk = None
+        if chunk:
+            self._rx += chunk
+            # Deal with the Hub killcode, after appending as its escape can be split
+            # between reads. Already replaced bytes cannot form the escape again.
+            # MicroPython's bytearray has no replace, so it is done on bytes
+            received = bytes(self._rx)
+            if _KILLCODE in received:
+                self._rx = bytearray(received.replace(_KILLCODE, _KILLCODE_REPL))
+        if not self._rx:
+            return None
+
+        try:
+            length = packet_length(self._rx)
         except:
+            log("Unknown packet, discarding " + str(len(self._rx)) + " bytes")
+            self._rx = bytearray()
             return None
+        if length is None or length > len(self._rx):
+            # Packet is fragmented, wait for the rest of it
+            return None
+        raw = bytes(self._rx[:length])
+        self._rx = self._rx[length:]
         return raw
 
     async def _recv_loop(self):
         """
             The receive loop that handles listeners
         """
+        idle_ms = _IDLE_MIN_MS
         while True:
             raw = self._recv_raw()
             if not raw:
-                await asyncio.sleep(1)
+                # Back off gradually whilst the link is quiet
+                await asyncio.sleep_ms(idle_ms)
+                idle_ms = min(idle_ms * 3 // 2, _IDLE_MAX_MS)
                 continue
-            
-            # Deal with the Hub killcode
-            raw = raw.replace(b"\x7e\x7e",b"\x03")
+            idle_ms = _IDLE_MIN_MS
             
             # Grab the code of this packet
             try:
                 code = Packet.get_code(raw)
             except:
-                await asyncio.sleep(1)
+                log("Unable to read packet code")
                 continue
 
             log("Received code: " + str(code))
 
-            if code in self.listeners.keys():
+            listener = self.listeners.get(code)
+            if listener is not None:
                 unpacked = class_by_code(code).unpack(raw)
-                asyncio.create_task(self.listeners[code](self, unpacked))
+                if code == Directions.CODE:
+                    # Moves are handled one after another, in the order they were received
+                    self._directions.append((listener, unpacked))
+                    self._directions_ready.set()
+                else:
+                    # Everything else gets its own task, so is answered even during a move
+                    asyncio.create_task(listener(self, unpacked))
+
+    async def _directions_loop(self):
+        """
+            Handles the received Directions one at a time, whilst the receive loop keeps running
+        """
+        while True:
+            await self._directions_ready.wait()
+            self._directions_ready.clear()
+            while self._directions:
+                listener, unpacked = self._directions.pop(0)
+                try:
+                    await listener(self, unpacked)
+                except Exception as e:
+                    log("Directions handler failed, " + str(e))
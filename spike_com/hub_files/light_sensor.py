@@ -25,4 +25,25 @@ class LightSensor:
         """
             Get the colour currently recorded
         """
-        return self._device.get()[1]
\ No newline at end of file
+        return self._device.get()[1]
+
+    def snapshot(self):
+        """
+            Return the current readings of the sensor, to be read with the *_from methods
+                so one reading can be shared between several values
+        """
+        return self._device.get()
+
+    @staticmethod
+    def reflection_from(snapshot):
+        """
+            Return the light reflection in the given snapshot
+        """
+        return snapshot[0]
+
+    @staticmethod
+    def colour_from(snapshot):
+        """
+            Return the colour in the given snapshot
+        """
+        return snapshot[1]
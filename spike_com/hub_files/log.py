@@ -5,15 +5,52 @@ import time
 
 LOG_FILE_NAME = "log.txt"
 
-def log(text):
+# Log levels, log skips messages above LEVEL before formatting them. Callers that
+# build a costly message themselves check LEVEL first, as do_safe_move does
+INFO = 1
+DEBUG = 2
+LEVEL = DEBUG # The safe move digests are debug output, and the GUI replays them
+
+_log_file = None # Kept open between writes, see _write
+
+def _timestamp():
     year, month, mday, hour, minute, second, weekday, yearday = time.localtime()
     datetime = str(mday) + "/" + str(month) + "/" + str(year) + " " + str(hour) + ":" + str(minute) + ":" + str(second)
-    text = "[" + datetime + "] " + str(text) + "\n"
-    with open(LOG_FILE_NAME, "a") as f:
-        f.write(text)
+    return "[" + datetime + "] "
+
+def _write(text):
+    """
+        Append text to the log file, opening it on first use only
+    """
+    global _log_file
+    if _log_file is None:
+        _log_file = open(LOG_FILE_NAME, "a")
+    _log_file.write(text)
+    # Flush so the log survives the program being stopped
+    _log_file.flush()
     print(text)
 
+def log(text, *args, level=INFO):
+    """
+        Log a line at the given level, any args are formatted into text with %
+            only when the line is written
+    """
+    if level > LEVEL:
+        return
+    if args:
+        text = text % args
+    _write(_timestamp() + str(text) + "\n")
+
+def log_lines(lines):
+    """
+        Log several lines with a single write, each prefixed with the same timestamp
+    """
+    prefix = _timestamp()
+    _write("".join([prefix + str(line) + "\n" for line in lines]))
+
 def reset():
-    f = open(LOG_FILE_NAME, "w")
-    f.write("")
-    f.close()
\ No newline at end of file
+    global _log_file
+    if _log_file is not None:
+        _log_file.close()
+    # Truncate the log and keep it open for the following writes
+    _log_file = open(LOG_FILE_NAME, "w")
\ No newline at end of file
@@ -6,6 +6,7 @@ import hub
 import time
 import uasyncio as asyncio
 import sys
+from array import array
 os.chdir("/spikecom/")
 sys.path.insert(1, "/spikecom/") # Required to get into correct working directory
                                  # cannot find a nice way to auto this
@@ -20,19 +21,35 @@ from light_sensor import LightSensor, Colour
 from push_sensor import PushSensor
 import log
 
+def is_attached(port):
+    """
+        Return whether a device is plugged into the given port
+    """
+    return getattr(hub.port, port).device is not None
+
+# Optional sensors, checks using them are skipped when they are not attached
+HAS_DISTANCE_SENSOR = is_attached("D")
+HAS_PUSH_SENSOR = is_attached("E")
+HAS_LIGHT_SENSOR = is_attached("F")
+
 LEFT_WHEEL = Motor("A")
 RIGHT_WHEEL = Motor("B", inverted=True)
 WHEEL_PAIR = MotorPair(LEFT_WHEEL, RIGHT_WHEEL)
-DISTANCE_SENSOR = Ultrasonic("D")
-PUSH_SENSOR = PushSensor("E")
+DISTANCE_SENSOR = Ultrasonic("D") if HAS_DISTANCE_SENSOR else None
+PUSH_SENSOR = PushSensor("E") if HAS_PUSH_SENSOR else None
 GYROSENSOR = GyroSensor()
-LIGHT_SENSOR_BOTTOM = LightSensor("F")
+LIGHT_SENSOR_BOTTOM = LightSensor("F") if HAS_LIGHT_SENSOR else None
 CORRECTION_SYSTEM_ENABLED = False
+WHITE_CHECK_ENABLED = False # Stop when the bottom sensor sees white
+MONITOR_TICK_MS = 100 # Time between safe move samples, the logged power values rely on this
+SAFETY_TICK_MS = 50 # Time between safe move hazard checks
+DISTANCE_CHECK_INTERVAL = 6 # Safety ticks between distance sensor reads
+DEGREES_PER_TICK_TO_RPM = 60000 / (360 * MONITOR_TICK_MS)
 
 
-def play_sound(sound_file):
+async def play_sound(sound_file):
     hub.sound.play(sound_file)
-    time.sleep(1)
+    await asyncio.sleep_ms(1000)
 
 async def on_ping(handler, data):
     handler.send(Ping())
@@ -40,12 +57,63 @@ async def on_ping(handler, data):
 
 async def on_get_distance(handler, data):
     log.log("on_get_distance")
+    if not HAS_DISTANCE_SENSOR:
+        log.log("get_distance failed, no distance sensor attached")
+        return
     try:
         handler.send(DistanceSend(DISTANCE_SENSOR.get_distance()))
     except Exception as e:
         log.log("get_distance failed, " + str(e))
 
-def do_safe_move(instruction):
+def estimate_samples(instruction):
+    """
+        Estimate how many monitoring ticks a move will take, assuming the motors
+            turn roughly 10 degrees a second for each 1% of speed
+    """
+    speed = max(1, abs(instruction.left_motor_speed))
+    ticks = (instruction.left_motor_degrees * 100) // (speed * MONITOR_TICK_MS)
+    # Leave some headroom, the buffers are doubled if this is exceeded anyway
+    return max(16, ticks + ticks // 2)
+
+async def safety_loop(stopped):
+    """
+        Watch the sensors during a move, stopping the wheels and setting stopped
+            as soon as one of them reports a hazard. Runs until cancelled
+    """
+    last_distance = 9999
+    distance_tick = DISTANCE_CHECK_INTERVAL # Read the distance on the first tick
+    if HAS_LIGHT_SENSOR:
+        light_snapshot = LIGHT_SENSOR_BOTTOM.snapshot
+    reflection_from = LightSensor.reflection_from
+    colour_from = LightSensor.colour_from
+    while True:
+        # Check interrupts, cheapest first with the slow distance sensor last
+        if HAS_LIGHT_SENSOR:
+            # One reading serves both light checks
+            light_state = light_snapshot()
+            if reflection_from(light_state) <= 2:
+                WHEEL_PAIR.stop()
+                log.log("INTERRUPT: Registered no reflection... stopping")
+                stopped.set()
+                return
+            if WHITE_CHECK_ENABLED and colour_from(light_state) == Colour.WHITE:
+                WHEEL_PAIR.stop()
+                log.log("INTERRUPT: Registered white on bottom sensor... stopping")
+                stopped.set()
+                return
+        # The rover cannot close 10cm between a few ticks, so read the distance less often
+        distance_tick += 1
+        if HAS_DISTANCE_SENSOR and distance_tick >= DISTANCE_CHECK_INTERVAL:
+            last_distance = DISTANCE_SENSOR.get_distance()
+            distance_tick = 0
+        if last_distance <= 10:
+            WHEEL_PAIR.stop()
+            log.log("INTERRUPT: Registered object 5cm infront... stopping")
+            stopped.set()
+            return
+        await asyncio.sleep_ms(SAFETY_TICK_MS)
+
+async def do_safe_move(instruction):
     # Get the directional yaw
     directional_yaw = GYROSENSOR.get_yaw()
     # Get current motor rotations
@@ -61,118 +129,161 @@ def do_safe_move(instruction):
         #acceleration=2000
     )
 
-    time.sleep(0.1) # Allow time for the motors to start
+    await asyncio.sleep_ms(100) # Allow time for the motors to start
 
     # Monitoring
-    recorded_yaws = []
-    recorded_power = []
-    recorded_rotations = []
-    times = []
+    # Buffers are allocated up front and filled up to samples
+    capacity = estimate_samples(instruction)
+    samples = 0
+    recorded_yaws = [0] * capacity
+    # Left and right samples are kept in separate arrays to avoid a tuple per tick
+    left_power = array("h", recorded_yaws)
+    right_power = array("h", recorded_yaws)
+    left_rotations = array("l", recorded_yaws)
+    right_rotations = array("l", recorded_yaws)
+    times = [0] * capacity
+    buffers = (recorded_yaws, left_power, right_power, left_rotations, right_rotations, times)
     tolerance = 2 # Amount of tolerance
     last_time = time.ticks_ms()
-    while LEFT_WHEEL.is_running() or RIGHT_WHEEL.is_running():
-        current_yaw = GYROSENSOR.get_yaw()
-        recorded_yaws.append(current_yaw)
-        recorded_power.append((LEFT_WHEEL.get_current_power(), RIGHT_WHEEL.get_current_power()))
-        recorded_rotations.append((LEFT_WHEEL.get_rotation(), RIGHT_WHEEL.get_rotation()))
-        cur_time = time.ticks_ms()
-        times.append(time.ticks_diff(last_time, cur_time))
-        last_time = cur_time
-
-        # Check interrupts
-        if LIGHT_SENSOR_BOTTOM.get_colour() == Colour.WHITE and False:
-            log.log("INTERRUPT: Registered white on bottom sensor... stopping")
-            WHEEL_PAIR.stop()
-            play_sound("/sounds/scream.raw")
-            return False
-        if LIGHT_SENSOR_BOTTOM.get_reflecton() <= 2:
-            log.log("INTERRUPT: Registered no reflection... stopping")
-            WHEEL_PAIR.stop()
-            play_sound("/sounds/scream.raw")
-            return False
-        if DISTANCE_SENSOR.get_distance() <= 10:
-            log.log("INTERRUPT: Registered object 5cm infront... stopping")
-            WHEEL_PAIR.stop()
-            play_sound("/sounds/scream.raw")
-            return False
-
-        if CORRECTION_SYSTEM_ENABLED and abs(current_yaw - directional_yaw) > tolerance:
-            log.log("Incorrect yaw detected... correcting")
-            WHEEL_PAIR.stop()
-            hub.display.show("1")
-
-            # Perform rotation until we get to correct yaw
-            sign = lambda x: (-1, 1)[x<0]
-            while abs(current_yaw - directional_yaw) > 0:
-                # Which way are we incorrect?
-                dir = sign(current_yaw - directional_yaw)
-                # dir=1 means we turn left, dir=-1 means we turn right
-                if dir == 1:
-                    WHEEL_PAIR.start(1, 0)
-                else:
-                    WHEEL_PAIR.start(0, 1)
-                time.sleep(0.1)
-                current_yaw = GYROSENSOR.get_yaw()
-            WHEEL_PAIR.stop()
-            hub.display.show("2")
-            time.sleep(3)
-
-
-            # Begin instruction again
-            left_wheel_moved_by = abs(LEFT_WHEEL.get_rotation() - left_wheel_starting_rotation)
-            right_wheel_moved_by = abs(RIGHT_WHEEL.get_rotation() - right_wheel_starting_rotation)
 
-
-            if left_wheel_moved_by > instruction.left_motor_degrees or right_wheel_moved_by > instruction.right_motor_degrees:
+    # Bind the methods used every tick to locals, saving global and attribute lookups
+    left_snapshot = LEFT_WHEEL.snapshot
+    right_snapshot = RIGHT_WHEEL.snapshot
+    is_running_from = Motor.is_running_from
+    get_power_from = Motor.get_power_from
+    get_rotation_from = Motor.get_rotation_from
+    get_yaw = GYROSENSOR.get_yaw
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+    # Hazards are watched by their own task, so they are caught between samples
+    stopped = asyncio.Event()
+    safety_task = asyncio.create_task(safety_loop(stopped))
+    try:
+        while True:
+            # Read each motor once per tick
+            left_state = left_snapshot()
+            right_state = right_snapshot()
+            if not (is_running_from(left_state) or is_running_from(right_state)):
                 break
 
-            new_instruction = MoveInstruction(
-                left_motor_degrees=instruction.left_motor_degrees - left_wheel_moved_by,
-                left_motor_speed=20,
-                right_motor_degrees=instruction.right_motor_degrees - right_wheel_moved_by,
-                right_motor_speed=20
-            )
+            if samples == capacity:
+                # Out of room, double every buffer (the copied values are overwritten)
+                for buffer in buffers:
+                    buffer.extend(buffer[:capacity])
+                capacity *= 2
+
+            current_yaw = get_yaw()
+            recorded_yaws[samples] = current_yaw
+            left_power[samples] = get_power_from(left_state)
+            right_power[samples] = get_power_from(right_state)
+            left_rotations[samples] = get_rotation_from(left_state)
+            right_rotations[samples] = get_rotation_from(right_state)
+            cur_time = ticks_ms()
+            times[samples] = ticks_diff(last_time, cur_time)
+            last_time = cur_time
+            samples += 1
+
+            if CORRECTION_SYSTEM_ENABLED and abs(current_yaw - directional_yaw) > tolerance:
+                log.log("Incorrect yaw detected... correcting")
+                WHEEL_PAIR.stop()
+                hub.display.show("1")
+
+                # Perform rotation until we get to correct yaw
+                # Yaws are whole degrees, so a non-zero error means we are still off
+                yaw_error = current_yaw - directional_yaw
+                while yaw_error:
+                    # Which way are we incorrect?
+                    # Under the directional yaw means we turn left, otherwise we turn right
+                    if yaw_error < 0:
+                        WHEEL_PAIR.start(1, 0)
+                    else:
+                        WHEEL_PAIR.start(0, 1)
+                    await asyncio.sleep_ms(MONITOR_TICK_MS)
+                    current_yaw = get_yaw()
+                    yaw_error = current_yaw - directional_yaw
+                WHEEL_PAIR.stop()
+                hub.display.show("2")
+                await asyncio.sleep_ms(3000)
+
+
+                # Begin instruction again
+                left_wheel_moved_by = abs(LEFT_WHEEL.get_rotation() - left_wheel_starting_rotation)
+                right_wheel_moved_by = abs(RIGHT_WHEEL.get_rotation() - right_wheel_starting_rotation)
+
+
+                if left_wheel_moved_by > instruction.left_motor_degrees or right_wheel_moved_by > instruction.right_motor_degrees:
+                    break
+
+                new_instruction = MoveInstruction(
+                    left_motor_degrees=instruction.left_motor_degrees - left_wheel_moved_by,
+                    left_motor_speed=20,
+                    right_motor_degrees=instruction.right_motor_degrees - right_wheel_moved_by,
+                    right_motor_speed=20
+                )
 
-            for i in range(20):
+                # A single command, each re-issue would cancel the previous one
                 WHEEL_PAIR.run_for_degrees(
                     new_instruction.left_motor_degrees,
-                    speed=i
+                    speed=(new_instruction.left_motor_speed, new_instruction.right_motor_speed)
                 )
-                time.sleep(0.1)
-            time.sleep(0.1)
-        time.sleep(0.1)
+                await asyncio.sleep_ms(100) # Allow time for the motors to start
+            await asyncio.sleep_ms(MONITOR_TICK_MS)
+    finally:
+        safety_task.cancel()
+
+    if stopped.is_set():
+        # The safety task stopped the wheels, which ended the loop above
+        await play_sound("/sounds/scream.raw")
+        return False
+
+    if log.LEVEL < log.DEBUG:
+        # The digest is all that the samples are used for
+        return True
+
+    # Drop the unused space from the buffers that are logged as is
+    del recorded_yaws[samples:]
+    del times[samples:]
 
     try:
-        yaw_differences = [abs(x - directional_yaw) for x in recorded_yaws]
-        if len(yaw_differences) > 0:
-            average_difference = sum(yaw_differences) / len(yaw_differences)
+        # Yaw differences and RPMs from rotations in a single pass over the samples
+        # Time between rotation changes is MONITOR_TICK_MS, we can calculate REAL RPM from this
+        yaw_differences = []
+        calculated_rpm = []
+        yaw_differences_append = yaw_differences.append
+        rpm_append = calculated_rpm.append
+        yaw_difference_sum = 0
+        previous_left_rotation = left_wheel_starting_rotation
+        previous_right_rotation = right_wheel_starting_rotation
+        for i in range(samples):
+            difference = abs(recorded_yaws[i] - directional_yaw)
+            yaw_differences_append(difference)
+            yaw_difference_sum += difference
+
+            left_rotation = left_rotations[i]
+            right_rotation = right_rotations[i]
+            rpm_append((
+                abs(left_rotation - previous_left_rotation) * DEGREES_PER_TICK_TO_RPM,
+                abs(right_rotation - previous_right_rotation) * DEGREES_PER_TICK_TO_RPM))
+            previous_left_rotation = left_rotation
+            previous_right_rotation = right_rotation
+
+        if samples > 0:
+            average_difference = yaw_difference_sum / samples
         else:
             average_difference = 0
 
-        # Calculating RPMs from rotations
-        calculated_rotation_offsets = []
-        calculated_rotation_offsets.append((recorded_rotations[0][0] - left_wheel_starting_rotation, recorded_rotations[0][1] - right_wheel_starting_rotation))
-        for i in range(1, len(recorded_rotations) - 1):
-            calculated_rotation_offsets.append(
-                (abs(recorded_rotations[i][0] - recorded_rotations[i-1][0]), 
-                abs(recorded_rotations[i][1] - recorded_rotations[i-1][1]))
-            )
-        # Time between rotation changes is 0.1, we can calculate REAL RPM from this
-        calculated_rpm = []
-        for offsets in calculated_rotation_offsets:
-            calculated_rpm.append(
-                ((offsets[0] / 360) * 600, (offsets[1] / 360) * 600))
-
-        log.log("#######SAFE MOVE DIGEST########")
-        log.log("Starting Yaw: " + str(directional_yaw))
-        log.log("Ending Yaw: " + str(recorded_yaws[-1]))
-        log.log("Recorded Yaws: " + str(recorded_yaws))
-        log.log("Yaw Differences: " + str(yaw_differences))
-        log.log("Average Difference: " + str(average_difference))
-        log.log("Power Values: " + str(recorded_power))
-        log.log("RPM Values:" + str(calculated_rpm))
-        log.log("Times:" + str(times))
-        log.log("#######SAFE MOVE DIGEST########")
+        log.log_lines([
+            "#######SAFE MOVE DIGEST########",
+            "Starting Yaw: " + str(directional_yaw),
+            "Ending Yaw: " + str(recorded_yaws[-1]),
+            "Recorded Yaws: " + str(recorded_yaws),
+            "Yaw Differences: " + str(yaw_differences),
+            "Average Difference: " + str(average_difference),
+            "Power Values: " + str(list(zip(left_power[:samples], right_power[:samples]))),
+            "RPM Values:" + str(calculated_rpm),
+            "Times:" + str(times),
+            "#######SAFE MOVE DIGEST########",
+        ])
     except Exception as e:
         log.log(e)
     return True
@@ -187,9 +298,8 @@ def rotate(instruction):
     #new_yaw = (current_yaw + amount)
     #if new_yaw > 180:
      #   new_yaw -= 360
-    log.log(str(current_yaw) + ":" + str(new_yaw))
+    log.log("%s:%s", current_yaw, new_yaw, level=log.DEBUG)
     # Now move until we get the yaw
-    sign = lambda x: (-1, 1)[x<0]
     while abs(current_yaw - new_yaw) > 1:
         # Which way are we incorrect?
         dir = (((current_yaw % 360) - (new_yaw % 360)) % 360) >= 180
@@ -203,77 +313,102 @@ def rotate(instruction):
     WHEEL_PAIR.stop()
 
 
-def mine(instruction):
+async def mine(instruction):
     """
         Perform a mining command
     """
     mining_time = 5
 
+    if not HAS_PUSH_SENSOR:
+        log.log("No push sensor attached, unable to mine")
+        return
+
     # Drive forward until we get a touch on the pressure sensor
     WHEEL_PAIR.start(a_speed=10, b_speed=10)
     
-    elapsed = 0
+    elapsed_ms = 0
     while not PUSH_SENSOR.is_pushed():
         # TODO: Some form of timeout
-        time.sleep(0.1)
-        elapsed += 0.1
+        await asyncio.sleep_ms(100)
+        elapsed_ms += 100
     
     # Sensor pushed, stop wheels
     WHEEL_PAIR.stop()
 
     # Start mining
-    play_sound("/sounds/digging.raw")
-    time.sleep(mining_time)
+    await play_sound("/sounds/digging.raw")
+    await asyncio.sleep(mining_time)
 
     # Now reverse back
     WHEEL_PAIR.start(a_speed=-10, b_speed=-10)
-    time.sleep(elapsed)
+    await asyncio.sleep_ms(elapsed_ms)
     WHEEL_PAIR.stop()
 
 
+async def _do_move(handler, instruction):
+    log.log("MoveInstruction")
+    try:
+        await do_safe_move(instruction)
+    except Exception as e:
+        log.log(str(e))
+        hub.sound.beep(5000)
+        return False
+    log.log("Finished move instruction")
+    return True
+
+async def _do_distance(handler, instruction):
+    log.log("DistanceInstruction")
+    await on_get_distance(handler, None)
+    log.log("Finished DistanceInstruction")
+    return True
+
+async def _do_mine(handler, instruction):
+    log.log("MiningInstruction")
+    try:
+        await mine(instruction)
+    except Exception as e:
+        log.log(str(e))
+    log.log("Finished MiningInstruction")
+    return True
+
+async def _do_rotate(handler, instruction):
+    log.log("RotateInstruction")
+    try:
+        rotate(instruction)
+    except Exception as e:
+        log.log(str(e))
+    log.log("Finished RotateInstruction")
+    return True
+
+# Instruction handlers by instruction type, each returns whether to carry on
+_HANDLERS = {
+    MoveInstruction: _do_move,
+    DistanceInstruction: _do_distance,
+    MiningInstruction: _do_mine,
+    RotateInstruction: _do_rotate,
+}
+INSTRUCTION_GAP_MS = 50 # Pause between instructions, lets other tasks run
+
 async def on_new_directions(handler, directions):
+    # Beep once to acknowledge the directions, not once per instruction
+    hub.sound.beep(1000)
     for instruction in directions.instructions:
-        hub.sound.beep(1000)
-        if isinstance(instruction, MoveInstruction):
-            log.log("MoveInstruction")
-            try:
-                do_safe_move(instruction)
-            except Exception as e:
-                log.log(str(e))
-                hub.sound.beep(5000)
-                break
-            log.log("Finished move instruction")
-        elif isinstance(instruction, DistanceInstruction):
-            log.log("DistanceInstruction")
-            await on_get_distance(handler, None)
-            log.log("Finished DistanceInstruction")
-        elif isinstance(instruction, MiningInstruction):
-            log.log("MiningInstruction")
-            try:
-                mine(instruction)
-            except Exception as e:
-                log.log(str(e))
-            log.log("Finished MiningInstruction")
-        elif isinstance(instruction, RotateInstruction):
-            log.log("RotateInstruction")
-            try:
-                rotate(instruction)
-            except Exception as e:
-                log.log(str(e))
-            log.log("Finished RotateInstruction")
-        time.sleep(1)
+        handler_function = _HANDLERS.get(type(instruction))
+        if handler_function is not None and not await handler_function(handler, instruction):
+            break
+        await asyncio.sleep_ms(INSTRUCTION_GAP_MS)
     
     # Do victory dance ???
-    play_sound("/sounds/victory.raw")
-    time.sleep(1)
+    await play_sound("/sounds/victory.raw")
+    await asyncio.sleep_ms(1000)
     WHEEL_PAIR.start(100, -100)
-    time.sleep(2)
-    play_sound("/sounds/victory.raw")
+    await asyncio.sleep_ms(2000)
+    await play_sound("/sounds/victory.raw")
     WHEEL_PAIR.stop()
     WHEEL_PAIR.start(-100, 100)
-    time.sleep(2)
+    await asyncio.sleep_ms(2000)
     WHEEL_PAIR.stop()
-    play_sound("/sounds/victory.raw")
+    await play_sound("/sounds/victory.raw")
 
 async def main():
     # Reset log
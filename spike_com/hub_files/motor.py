@@ -6,7 +6,6 @@
 """
 import time
 import hub
-from log import log
 
 class Motor:
     """
@@ -30,7 +29,8 @@ class Motor:
         """
         self.port = port
         self.rotation = 0 # Unknown right now
-        assert self.port in ['A', 'B', 'C', 'D', 'E', 'F']
+        if port not in ('A', 'B', 'C', 'D', 'E', 'F'):
+            raise ValueError("Invalid port " + str(port))
         self.inverted = inverted
         self._motor = getattr(hub.port, port).motor
         self._motor.mode([(1,0), (2,2), (3,1), (0,0)])
@@ -65,6 +65,35 @@ class Motor:
             speed = -speed
         self._motor.run_for_degrees(degrees, speed=speed)
     
+    def snapshot(self):
+        """
+            Return the current state of the motor, to be read with the *_from methods
+                so one reading can be shared between several values
+        """
+        return self._motor.get()
+
+    @staticmethod
+    def get_rotation_from(snapshot):
+        """
+            Return the rotation of the motor in the given snapshot
+        """
+        return snapshot[1]
+
+    @staticmethod
+    def get_power_from(snapshot):
+        """
+            Return the power of the motor in the given snapshot
+        """
+        return snapshot[3]
+
+    @staticmethod
+    def is_running_from(snapshot):
+        """
+            Return whether the motor is running in the given snapshot
+        """
+        current_power = snapshot[3]
+        return current_power == None or current_power > 0
+
     def get_rotation(self):
         """
             Return current rotation of motor
@@ -84,8 +113,7 @@ class Motor:
         """
             Return whether the motor is running
         """
-        current_power = self.get_current_power()
-        return current_power == None or current_power > 0
+        return Motor.is_running_from(self._motor.get())
     
     def wait_until_finished(self):
         """
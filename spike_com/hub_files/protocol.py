@@ -121,20 +121,28 @@ class MoveInstruction(Packet):
             self.right_motor_speed)
         return self._encapsulate(payload)
 
+    @classmethod
+    def _from_wire(cls, left_motor_degrees, left_motor_speed,
+                   right_motor_degrees, right_motor_speed):
+        """
+            Create a MoveInstruction from unpacked values, skipping the
+                normalisation in __init__ as packed degrees are never negative
+        """
+        instruction = cls.__new__(cls)
+        instruction.code = cls.CODE
+        instruction.left_motor_degrees = left_motor_degrees
+        instruction.left_motor_speed = left_motor_speed
+        instruction.right_motor_degrees = right_motor_degrees
+        instruction.right_motor_speed = right_motor_speed
+        return instruction
+
     @staticmethod
     def unpack(data):
         """
             Unpack the MoveInstruction Packet
         """
         payload = Packet.decapsulate(data)
-        left_motor_degrees, left_motor_speed, right_motor_degrees,\
-              right_motor_speed = struct.unpack("!hhhh", payload)
-        return MoveInstruction(
-            left_motor_degrees=left_motor_degrees,
-            left_motor_speed=left_motor_speed,
-            right_motor_degrees=right_motor_degrees,
-            right_motor_speed=right_motor_speed
-        )
+        return MoveInstruction._from_wire(*struct.unpack("!hhhh", payload))
 
 class RotateInstruction(Packet):
     """
@@ -253,6 +261,23 @@ class Directions(Packet):
             payload += packed_instruction
         return self._encapsulate(bytes(payload))
 
+    @staticmethod
+    def packed_length(data):
+        """
+            Get the length of the packed Directions at the start of data,
+                or None if data does not yet hold all of it
+        """
+        if len(data) < 2:
+            return None
+        # Code and number of instructions, then each size-prefixed instruction
+        no_instructions = data[1]
+        length = 2
+        for _ in range(no_instructions):
+            if len(data) <= length:
+                return None
+            length += 1 + data[length]
+        return length
+
     @staticmethod
     def unpack(data):
         """
@@ -261,30 +286,19 @@ class Directions(Packet):
         # Get decaspulated payload
         payload = Packet.decapsulate(data)
         # Read the number of instructions this contained
-        no_instructions, = struct.unpack("!B", payload[:1])
+        no_instructions = payload[0]
         # Create a new Directions object
         directions = Directions()
         current_index = 1
         for _ in range(no_instructions):
-            # Read the ith instruction
-            # Read the size of the instruction
-            instruction_size, = struct.unpack("!B", payload[current_index:current_index+1])
-            current_index += 1
-            # Now read the actual instruction
-            packed_instruction, = struct.unpack("!" + str(instruction_size) + "s",
-                payload[current_index:current_index + instruction_size])
-            current_index += instruction_size
-            # Now get the code of this instruction
-            code = Packet.get_code(packed_instruction)
-            print("Found code " + str(code))
-            if code == MoveInstruction.CODE:
-                directions.add_instruction(MoveInstruction.unpack(packed_instruction))
-            elif code == DistanceInstruction.CODE:
-                directions.add_instruction(DistanceInstruction())
-            elif code == MiningInstruction.CODE:
-                directions.add_instruction(MiningInstruction.unpack(packed_instruction))
-            elif code == RotateInstruction.CODE:
-                directions.add_instruction(RotateInstruction.unpack(packed_instruction))
+            # Read the size and code of the ith instruction
+            instruction_size = payload[current_index]
+            code = payload[current_index + 1]
+            # Now unpack the actual instruction, skipping its size and code
+            instruction = _unpack_instruction(code, payload, current_index + 2)
+            if instruction is not None:
+                directions.add_instruction(instruction)
+            current_index += 1 + instruction_size
         return directions
 
 CODES = {
@@ -297,8 +311,52 @@ CODES = {
     100: Directions,
 }
 
+# Packed length of each fixed size packet, including the code
+SIZES = {
+    0: 1,
+    1: 9,
+    2: 1,
+    3: 3,
+    4: 3,
+    5: 5,
+}
+
+# Field format and constructor of each instruction that may be held in a Directions,
+#   instructions without fields have no format
+INSTRUCTION_UNPACKERS = {
+    MoveInstruction.CODE: ("!hhhh", MoveInstruction._from_wire),
+    DistanceInstruction.CODE: (None, DistanceInstruction),
+    MiningInstruction.CODE: ("!h", MiningInstruction),
+    RotateInstruction.CODE: ("!hh", RotateInstruction),
+}
+
+def _unpack_instruction(code, payload, offset):
+    """
+        Unpack the fields of an instruction straight from the bytes at offset in payload,
+            or return None if the code is not an instruction
+    """
+    unpacker = INSTRUCTION_UNPACKERS.get(code)
+    if unpacker is None:
+        return None
+    fields_format, create = unpacker
+    if fields_format is None:
+        return create()
+    return create(*struct.unpack_from(fields_format, payload, offset))
+
 def class_by_code(code):
     """
         Get class by the code
     """
     return CODES[code]
+
+def packet_length(data):
+    """
+        Get the length of the packet at the start of data,
+            or None if data does not yet hold all of it
+
+        Raises KeyError if the packet code is unknown
+    """
+    code = Packet.get_code(data)
+    if code == Directions.CODE:
+        return Directions.packed_length(data)
+    return SIZES[code]
@@ -1,11 +1,10 @@
-import time
 import hub
-from log import log
 
 class Sensor:
     def __init__(self, port):
         self.port = port
-        assert self.port in ['A', 'B', 'C', 'D', 'E', 'F']
+        if port not in ('A', 'B', 'C', 'D', 'E', 'F'):
+            raise ValueError("Invalid port " + str(port))
         self._sensor = getattr(hub.port, port).device
 
 
@@ -17,8 +16,5 @@ class Ultrasonic(Sensor):
         self._sensor.mode(5, bytes([top_left, top_right, bottom_left, bottom_right]))
 
     def get_distance(self):
-        distance = self._sensor.get()[0]
-        if distance:
-            return int(distance)
-        else:
-            return 9999
+        # The sensor reports whole centimetres, or None when nothing is in range
+        return self._sensor.get()[0] or 9999
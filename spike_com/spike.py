@@ -3,13 +3,80 @@
 """
 import subprocess
 import os
-import time
-from threading import Thread
+import shutil
+import socket
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from ampy.pyboard import Pyboard, PyboardError
 from spike_com.host_files.main import Handler
+try:
+    import fcntl
+except ImportError: # Not available on Windows
+    fcntl = None
 
 # CONSTANTS
 MAC = "30:E2:83:03:7C:71"
 REMOTE_DIRECTORY = "/spikecom"
+PORT = "/dev/rfcomm0"
+# Bytes written per raw REPL command, Pyboard already paces the serial writes
+# so this is bounded by the hub's memory rather than its serial buffer
+UPLOAD_CHUNK_SIZE = 1024
+UPLOAD_WORKERS = 2 # One file is prepared whilst another is sent
+RFCOMM_CHANNEL = 1
+# Run on the hub to create the remote directory if it is missing
+MKDIR_COMMAND = f"import os\ntry:\n    os.mkdir('{REMOTE_DIRECTORY}')\nexcept OSError:\n    pass"
+RFCOMMCREATEDEV = 0x400452c8 # _IOW('R', 200, int) from bluez rfcomm.h
+# Missing from Python builds without Bluetooth support, which bind with rfcomm instead
+AF_BLUETOOTH = getattr(socket, "AF_BLUETOOTH", None)
+BTPROTO_RFCOMM = getattr(socket, "BTPROTO_RFCOMM", None)
+
+def _bind_rfcomm_ioctl(mac, device=0):
+    """
+        Bind /dev/rfcomm<device> to mac directly through the kernel, as rfcomm bind does
+            but without starting sudo and rfcomm. Needs CAP_NET_ADMIN, raises OSError without
+    """
+    # Mirrors the kernel's struct rfcomm_dev_req with native alignment:
+    #   s16 dev_id; (2 bytes padding) u32 flags; bdaddr_t src; bdaddr_t dst; u8 channel;
+    # padded to 24 bytes. Addresses are stored in reverse byte order
+    request = struct.pack("@hI6s6sBxxx", device, 0, bytes(6),
+                          bytes.fromhex(mac.replace(":", ""))[::-1], RFCOMM_CHANNEL)
+    with socket.socket(AF_BLUETOOTH, socket.SOCK_RAW, BTPROTO_RFCOMM) as control:
+        fcntl.ioctl(control, RFCOMMCREATEDEV, request)
+
+def _file_commands(data, remote_path):
+    """
+        Build the raw REPL commands that write data to remote_path on the hub
+    """
+    commands = [f"f.write({data[i:i + UPLOAD_CHUNK_SIZE]!r})"
+                for i in range(0, len(data), UPLOAD_CHUNK_SIZE)] or ["pass"]
+    # Open and close in the same commands as the first and last writes
+    commands[0] = f"f = open('{remote_path}', 'wb')\n" + commands[0]
+    commands[-1] += "\nf.close()"
+    return commands
+
+class Status:
+    """
+        Reports the progress of SpikeCom operations, every status line goes through
+            step so the output can be redirected in one place
+    """
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+
+    def step(self, message):
+        """
+            Report a step, flushing so it is seen before any long wait that follows
+        """
+        self.stream.write(message + "\n")
+        self.stream.flush()
+
+    def error(self, message, error):
+        """
+            Report an error, following message
+        """
+        self.step(message + str(error))
 
 class SpikeHandler:
     """
@@ -19,79 +86,180 @@ class SpikeHandler:
     def __init__(self):
         self.connected = False
         self.communication_handler = None
+        self.status = Status()
+        self._board_lock = Lock() # The link carries one command at a time
+        self._bound = False # Whether the port is bound, it is kept between calls
+        self._pending_releases = [] # Release processes that may still be running
+        # Releases are started from the GUI thread and waited for on the worker
+        self._releases_lock = Lock()
+        # Built once rather than for every ampy call, Windows has no sudo
+        self._ampy_prefix = (["ampy", "--port", PORT] if os.name == "nt"
+                             else ["sudo", "ampy", "--port", PORT])
+        # mpremote can copy every file in one process, ampy is used without it
+        self.use_mpremote = shutil.which("mpremote") is not None
+        # Connecting and sending run in order on one long lived worker thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spikecom")
+        self._closed = Event() # Set by close, a connection still being made is abandoned
     
     def _bind(self):
         """
-            Bind to port
+            Bind to port, reusing an existing binding
         """
+        if self._bound:
+            return
+        # A release still in progress would remove the binding we are about to use
+        with self._releases_lock:
+            pending_releases = list(self._pending_releases)
+        for release in pending_releases:
+            release.wait()
+        if os.path.exists(PORT):
+            # Already bound, binding again would fail and cost a link setup
+            self._bound = True
+            return
+        # Python builds without Bluetooth support fall back to rfcomm as well
+        if fcntl is not None and AF_BLUETOOTH is not None:
+            try:
+                _bind_rfcomm_ioctl(MAC)
+                self._bound = True
+                return
+            except OSError as error:
+                self.status.error("[Spike-Com] Unable to bind directly, using rfcomm: ", error)
         try:
             subprocess.run(["sudo", "rfcomm", "bind", "0", MAC], check=True)
+            self._bound = True
         except subprocess.CalledProcessError as error:
-            print("[Spike-Com] Error unable to bind: ", error)
+            self.status.error("[Spike-Com] Error unable to bind: ", error)
             self.disconnect()
     
+    def run_ampy_cmd(self, *cmds):
+        """
+            Run an ampy command on the hub, draining its output whilst it runs so a
+                full pipe cannot stall it, and returning once ampy has exited
+
+            :returns str: The output of the command
+            :raises subprocess.CalledProcessError: If ampy fails
+        """
+        args = self._ampy_prefix + list(cmds)
+        with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True) as process:
+            output, errors = process.communicate()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args, output, errors)
+        return output
+
+    def _report_error(self, future):
+        """
+            Report the error of a finished background call, if it raised one
+        """
+        if not future.cancelled() and future.exception() is not None:
+            self.status.error("[Spike-Com] Error in worker: ", future.exception())
+
     def connect(self, callback_function):
         """
-            Attempt to connect to the Rover
+            Attempt to connect to the Rover, callback_function is called with whether
+                it was successful
+
+            :returns Future: The connection attempt
+        """
+        future = self._executor.submit(self._do_connect)
+        future.add_done_callback(self._report_error)
+        future.add_done_callback(lambda done: callback_function(
+            not done.cancelled() and done.exception() is None and done.result()))
+        return future
+
+    def _do_connect(self):
+        """
+            Connect to the Rover, run on the worker thread
 
             :returns boolean: Whether successful
         """
-        def _connect():
-            self.disconnect()
-            # Attempt to make connection here
-            self._bind()
+        # A previous connection's threads would otherwise keep the port open
+        self._stop_handler()
+        self.disconnect()
+        # Attempt to make connection here
+        self._bind()
 
-            # Try to run the hub file
-            try:
-                subprocess.run(["sudo", "ampy", "--port", "/dev/rfcomm0", "run", "-n",
-                                "spike_com/hub_files/main.py"], check=True)
-            except subprocess.CalledProcessError as error:
-                print("[Spike-Com] Error unable to bind: ", error)
-                self.disconnect()
-                callback_function(False)
-                return
+        # Try to run the hub file
+        try:
+            self.run_ampy_cmd("run", "-n", "spike_com/hub_files/main.py")
+        except subprocess.CalledProcessError as error:
+            self.status.error("[Spike-Com] Error unable to bind: ", error)
+            self._stop_handler()
+            self.disconnect()
+            return False
 
-            time.sleep(5)
+        # Now create our communication handler, it pings until the hub's main.py answers
+        try:
+            # Kept locally, close may clear communication_handler from another thread
+            handler = self.communication_handler = Handler()
+            if self._closed.is_set():
+                # close ran before the handler existed, so could not stop it
+                self._stop_handler()
+                return False
+            handler.start()
+        except Exception as error: # pylint: disable=W0718
+            self.status.error("[Spike-Com] Error unable to start communication: ", error)
+            self._stop_handler()
+            self.disconnect()
+            return False
+        if self._closed.is_set():
+            return False
+        if not handler.connected:
+            self._stop_handler()
+            self.disconnect()
+            return False
+        self.connected = True
+        return True
 
-            # Now create our communication handler
-            try:
-                self.communication_handler = Handler()
-                self.communication_handler.start()
-            except Exception as error: # pylint: disable=W0718
-                print("[Spike-Com] Error unable to start communication: ", error)
-                self.disconnect()
-                callback_function(False)
-                return
-            if not self.communication_handler.connected:
-                self.disconnect()
-            else:
-                self.connected = True
-            callback_function(self.communication_handler.connected)
-
-        thread = Thread(target=_connect)
-        thread.start()
+    def _stop_handler(self):
+        """
+            Stop the communication handler, if there is one, so nothing is sent to a dead link
+        """
+        # Taken before stopping, close may call this whilst the worker does too
+        handler, self.communication_handler = self.communication_handler, None
+        if handler is not None:
+            handler.stop()
+        self.connected = False
     
     def send_instructions(self, instructions):
         """
-            Send instructions
+            Send instructions, after any connection attempt already requested
+
+            :returns Future: The send
+        """
+        future = self._executor.submit(self._do_send_instructions, instructions)
+        future.add_done_callback(self._report_error)
+        return future
+
+    def _do_send_instructions(self, instructions):
         """
-        def _send_instructions():
-            self.communication_handler.send_instructions(instructions)
-        thread = Thread(target=_send_instructions)
-        thread.start()
+            Send instructions, run on the worker thread
+        """
+        self.communication_handler.send_instructions(instructions)
     
     def get_log(self):
         """
-            Get the logs off the Rover
+            Get the logs off the Rover, yielding lines as they are received
+
+            :raises subprocess.CalledProcessError: Once the lines run out, if ampy failed
         """
         self._bind()
+        args = self._ampy_prefix + ["get", f"{REMOTE_DIRECTORY}/log.txt"]
+        with subprocess.Popen(args, stdout=subprocess.PIPE, universal_newlines=True) as process:
+            yield from process.stdout
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args)
+
+    def get_log_str(self):
+        """
+            Get the whole log off the Rover
+
+            :returns str: The log, or False if it could not be read
+        """
         try:
-            log = subprocess.check_output(["sudo", "ampy", "--port", "/dev/rfcomm0", "get",
-                            f"{REMOTE_DIRECTORY}/log.txt"], universal_newlines=True)
+            return "".join(self.get_log())
         except subprocess.CalledProcessError:
             return False
-        self.disconnect()
-        return str(log)
 
     def update_rover_files(self):
         """
@@ -99,30 +267,107 @@ class SpikeHandler:
         """
         self._bind()
         # Send all hub files to the hub
-        python_files = [x for x in os.listdir("spike_com/hub_files/") if
-                        x.endswith(".py") and not x == "main.py"]
-        # Create directory
-        subprocess.run(["sudo", "ampy", "--port", "/dev/rfcomm0", "mkdir",
-                        "--exists-okay", f"{REMOTE_DIRECTORY}"], check=False)
+        with os.scandir("spike_com/hub_files/") as entries:
+            python_files = [entry.name for entry in entries if entry.name.endswith(".py")
+                            and entry.name != "main.py" and entry.is_file()]
+        if self.use_mpremote:
+            self._update_with_mpremote(python_files)
+        else:
+            self._update_with_pyboard(python_files)
+
+    def _update_with_mpremote(self, python_files):
+        """
+            Upload the given hub files with a single chained mpremote command
+        """
+        args = ["mpremote", "connect", PORT, "exec", MKDIR_COMMAND]
         for file in python_files:
-            print(f"Uploading {file}")
-            subprocess.run(["sudo", "ampy", "--port", "/dev/rfcomm0", "rm",
-                            f"{REMOTE_DIRECTORY}/{file}"], check=False)
-            time.sleep(1)
-            subprocess.run(["sudo", "ampy", "--port", "/dev/rfcomm0",
-                "put", f"spike_com/hub_files/{file}", f"{REMOTE_DIRECTORY}/{file}"],
-                check=False)
-            time.sleep(1)
-        print("Update complete")
+            args += ["+", "cp", f"spike_com/hub_files/{file}", f":{REMOTE_DIRECTORY}/{file}"]
+        try:
+            subprocess.run(args, check=True)
+            self.status.step("Update complete")
+        except subprocess.CalledProcessError as error:
+            self.status.error("[Spike-Com] Error unable to update files: ", error)
+
+    def _update_with_pyboard(self, python_files):
+        """
+            Upload the given hub files through ampy's Pyboard
+        """
+        # One raw REPL session for every file, rather than an ampy process
+        # (and hub soft reset) per command
+        try:
+            board = Pyboard(PORT)
+        except PyboardError as error:
+            self.status.error("[Spike-Com] Error unable to open hub: ", error)
+            self.disconnect()
+            return
+        try:
+            board.enter_raw_repl()
+            board.exec_(MKDIR_COMMAND)
+            with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+                uploads = [executor.submit(self._upload_file, board, file)
+                           for file in python_files]
+                for upload in uploads:
+                    upload.result()
+            board.exit_raw_repl()
+            self.status.step("Update complete")
+        except PyboardError as error:
+            self.status.error("[Spike-Com] Error unable to update files: ", error)
+        finally:
+            board.close()
+
+    def _upload_file(self, board, file):
+        """
+            Upload a hub file, reading and encoding it before waiting for the link
+        """
+        with open(f"spike_com/hub_files/{file}", "rb") as local_file:
+            commands = _file_commands(local_file.read(), f"{REMOTE_DIRECTORY}/{file}")
+        with self._board_lock:
+            self.status.step(f"Uploading {file}")
+            for command in commands:
+                board.exec_(command)
+
+    def close(self):
+        """
+            Stop the worker, the communication handler and release the port
+        """
+        # Anything not yet started is dropped and a running call is not waited for,
+        # stopping the handler ends its connection attempt early
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._stop_handler()
         self.disconnect()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _reap_release(self, release):
+        """
+            Wait for a release process to exit, then forget it
+        """
+        release.wait()
+        with self._releases_lock:
+            self._pending_releases.remove(release)
+
     def disconnect(self):
         """
-            Disconnect from Hub
+            Disconnect from Hub, if the port is bound
         """
-        try:
-            if os.name != "nt":
-                subprocess.run(["sudo", "rfcomm", "release", "0"], check=True)
-        except subprocess.CalledProcessError as error:
-            print("[Spike-Com] Error unable to bind: ", error)
-        print("[Spike-Com] Disconnected!")
+        if self._bound:
+            self.force_disconnect()
+
+    def force_disconnect(self):
+        """
+            Release the port, even if it was not bound by this handler. Returns without
+                waiting for the release, _bind waits for it before binding again
+        """
+        if os.name != "nt":
+            # Left running rather than waited for in a with block, _reap_release waits for it
+            release = subprocess.Popen(["sudo", "rfcomm", "release", "0"]) # pylint: disable=R1732
+            with self._releases_lock:
+                self._pending_releases.append(release)
+            Thread(target=self._reap_release, args=(release,), daemon=True).start()
+        self._bound = False
+        self.status.step("[Spike-Com] Disconnected!")